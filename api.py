@@ -0,0 +1,227 @@
+"""
+Read-only JSON API over every entity
+
+    GET /api/{entity}?fields=id,name&limit=50&cursor=...
+    GET /api/{entity}/{id}?fields=...
+
+Lists are ordered by id and paged with a cursor (the last id of the
+previous page). Only the selected columns are read, without building ORM
+objects.
+
+Dashboard charts read two more routes, declared before the entity routes:
+
+    GET /api/charts/financials?granularity=month&start_date=...&end_date=...
+    GET /api/charts/projects
+
+Responses carry a strong ETag derived from the entity's change counter
+(see versions.py) and the request parameters, and a Last-Modified date.
+A request whose If-None-Match matches gets 304 Not Modified after reading
+only the counter, without querying any rows (see http_cache.py).
+"""
+import json
+from datetime import date, time, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from construction_erp import models, versions, http_cache, summary
+from construction_erp.database import get_read_db, db_route
+from construction_erp.pagination import PAGE_SIZE, page_url
+
+# Largest page a client may ask for
+MAX_LIMIT = 500
+
+# Most periods one chart series request may cover
+MAX_PERIODS = 1000
+
+# Periods shown when no start date is given
+DEFAULT_PERIODS = {"day": 30, "week": 12, "month": 12}
+
+# The financial summaries and their source tables; summary.rebuild() bumps them all
+SUMMARY_TABLES = ("financial_summaries", "payments", "invoices", "expenses", "paid_accounts")
+
+# Entity name in the URL -> model
+ENTITIES = {
+    "employees": models.Employee,
+    "worklogs": models.WorkLog,
+    "payments": models.Payment,
+    "projects": models.Project,
+    "project_costs": models.ProjectCost,
+    "invoices": models.Invoice,
+    "accounts_payable": models.AccountsPayable,
+    "paid_accounts": models.PaidAccount,
+    "expenses": models.Expense,
+}
+
+router = APIRouter(prefix="/api")
+
+
+def _table(entity: str):
+    if entity not in ENTITIES:
+        raise HTTPException(status_code=404, detail="Unknown entity")
+    return ENTITIES[entity].__table__
+
+
+def _columns(table, fields: Optional[str]) -> List:
+    """Columns named in a comma separated fields parameter, all columns if empty"""
+    if not fields:
+        return list(table.columns)
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in table.columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return [table.columns[name] for name in names]
+
+
+def _json_value(value):
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return value
+
+
+def _json_response(content, etag: str, last_modified) -> Response:
+    return Response(
+        content=json.dumps(content, separators=(",", ":")),
+        media_type="application/json",
+        headers=http_cache.headers(etag, last_modified),
+    )
+
+
+@router.get("/charts/financials")
+@db_route
+def financial_series(
+    request: Request,
+    granularity: str = "month",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Revenue, payroll, expense and paid account totals per day, week or month"""
+    if granularity not in summary.GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of {', '.join(summary.GRANULARITIES)}")
+    end_date = end_date or date.today()
+    if start_date is None:
+        # The last DEFAULT_PERIODS periods, including the current one
+        start_date = summary.period_start(end_date, granularity)
+        for _ in range(DEFAULT_PERIODS[granularity] - 1):
+            start_date = summary.period_start(start_date - timedelta(days=1), granularity)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    if len(summary.periods(start_date, end_date, granularity)) > MAX_PERIODS:
+        raise HTTPException(status_code=400, detail=f"Range spans more than {MAX_PERIODS} periods")
+
+    # Default ranges move with the date, so responses are never older than today
+    table_versions, last_modified = versions.snapshot(db, SUMMARY_TABLES)
+    last_modified = http_cache.not_before_today(last_modified)
+    etag = http_cache.etag(request, table_versions, start_date, end_date)
+    if http_cache.is_not_modified(request, etag, last_modified):
+        return http_cache.not_modified(etag, last_modified)
+
+    content = summary.series(db, granularity, start_date, end_date)
+    content.update(granularity=granularity, start_date=start_date.isoformat(), end_date=end_date.isoformat())
+    return _json_response(content, etag, last_modified)
+
+
+@router.get("/charts/projects")
+@db_route
+def project_series(request: Request, limit: int = 5, db: Session = Depends(get_read_db)):
+    """Value and total costs of the most recently started active projects"""
+    if not 1 <= limit <= MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_LIMIT}")
+    today = date.today()
+
+    # Projects become inactive as days pass, so the date is part of the ETag
+    table_versions, last_modified = versions.snapshot(db, ["projects"])
+    last_modified = http_cache.not_before_today(last_modified)
+    etag = http_cache.etag(request, table_versions, today)
+    if http_cache.is_not_modified(request, etag, last_modified):
+        return http_cache.not_modified(etag, last_modified)
+
+    projects = models.Project.__table__
+    rows = db.execute(
+        select(projects.c.name, projects.c.value, projects.c.total_costs)
+        .where((projects.c.end_date == None) | (projects.c.end_date >= today))
+        .order_by(projects.c.start_date.desc())
+        .limit(limit)
+    ).all()
+    return _json_response({
+        "labels": [name for name, _, _ in rows],
+        "series": {
+            "value": [round(value or 0.0, 2) for _, value, _ in rows],
+            "total_costs": [round(total_costs or 0.0, 2) for _, _, total_costs in rows],
+        },
+    }, etag, last_modified)
+
+
+@router.get("/{entity}")
+@db_route
+def list_entities(
+    request: Request,
+    entity: str,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = PAGE_SIZE,
+    db: Session = Depends(get_read_db)
+):
+    """One page of an entity's rows, ordered by id"""
+    table = _table(entity)
+    columns = _columns(table, fields)
+    if not 1 <= limit <= MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_LIMIT}")
+    try:
+        after_id = int(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid page cursor")
+
+    table_versions, last_modified = versions.snapshot(db, [table.name])
+    etag = http_cache.etag(request, table_versions)
+    if http_cache.is_not_modified(request, etag, last_modified):
+        return http_cache.not_modified(etag, last_modified)
+
+    statement = select(table.c.id, *columns).order_by(table.c.id).limit(limit + 1)
+    if after_id is not None:
+        statement = statement.where(table.c.id > after_id)
+    rows = db.execute(statement).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = str(rows[-1][0])
+
+    names = [column.name for column in columns]
+    data = [dict(zip(names, map(_json_value, row[1:]))) for row in rows]
+    return _json_response({
+        "data": data,
+        "next_cursor": next_cursor,
+        "next": page_url(request, cursor=next_cursor) if next_cursor else None,
+    }, etag, last_modified)
+
+
+@router.get("/{entity}/{item_id}")
+@db_route
+def get_entity(
+    request: Request,
+    entity: str,
+    item_id: int,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """One row of an entity by id"""
+    table = _table(entity)
+    columns = _columns(table, fields)
+
+    table_versions, last_modified = versions.snapshot(db, [table.name])
+    etag = http_cache.etag(request, table_versions)
+    if http_cache.is_not_modified(request, etag, last_modified):
+        return http_cache.not_modified(etag, last_modified)
+
+    row = db.execute(select(*columns).where(table.c.id == item_id)).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    return _json_response(
+        {column.name: _json_value(value) for column, value in zip(columns, row)}, etag, last_modified
+    )
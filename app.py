@@ -1,27 +1,89 @@
-from fastapi import FastAPI, Request, Depends, Form, HTTPException
-from fastapi.templating import Jinja2Templates
+import time
+
+# Start of worker startup, before any imports, reported once the worker is ready (see lifespan)
+_imports_began = time.perf_counter()
+
+from fastapi import FastAPI, Request, Depends, Form, HTTPException, UploadFile, File
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import RedirectResponse, StreamingResponse, Response
+from sqlalchemy.orm import Session, joinedload, selectinload
 from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any
+from contextlib import asynccontextmanager
+import io
+import logging
 import os
 from pathlib import Path
 import urllib.parse
 
 from construction_erp import models
-from construction_erp.database import engine, get_db
-from construction_erp.validation import validate_form_data, ValidationError
+from construction_erp.database import engine, read_engine, get_db, get_read_db, db_route
+from construction_erp.payroll import calculate_payroll, calculate_daily_payroll
+from construction_erp.validation import validate_form_data, ValidationError, parse_time
+from construction_erp.migrations import check_schema
+from construction_erp import summary, versions, rollups
+from construction_erp.cache import report_cache
+from construction_erp.reports import build_report, REPORT_TABLES
+from construction_erp.export import export_report, EXPORT_COLUMNS, EXPORT_FORMATS
+from construction_erp.timesheets import import_worklogs
+from construction_erp.pagination import keyset_page, totals, page_url
+from construction_erp.instrumentation import InstrumentationMiddleware, TimedTemplate
+from construction_erp import metrics, api, http_cache
+from construction_erp.templating import create_templates, warm_up
+from construction_erp.compression import CompressionMiddleware
+from construction_erp.assets import ASSETS_URL, ImmutableStaticFiles, static_url
+from construction_erp.config import STATIC_BUILD_DIR
+
+logger = logging.getLogger("construction_erp")
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# Start of app setup after the imports
+_setup_began = time.perf_counter()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    set_up = time.perf_counter()
+    
+    # Create or upgrade the schema only when its stored version is outdated
+    schema_version = check_schema(engine)
+    checked = time.perf_counter()
+    
+    # Compile every template before the worker accepts requests
+    warm_up(templates.env)
+    ready = time.perf_counter()
+    
+    metrics.record_startup({
+        "imports": _setup_began - _imports_began,
+        "setup": set_up - _setup_began,
+        "schema_check": checked - set_up,
+        "templates": ready - checked,
+    })
+    logger.info(
+        "Worker ready in %.3fs (imports %.3fs, setup %.3fs, schema check %.3fs, templates %.3fs), "
+        "schema version %d",
+        ready - _imports_began, _setup_began - _imports_began, set_up - _setup_began,
+        checked - set_up, ready - checked, schema_version
+    )
+    yield
 
-app = FastAPI(title="Construction ERP")
+app = FastAPI(title="Construction ERP", lifespan=lifespan)
+app.add_middleware(InstrumentationMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+
+app.include_router(api.router)
+
+metrics.instrument_engine(engine, "write")
+if read_engine is not engine:
+    metrics.instrument_engine(read_engine, "read")
 
 # Set up templates and static files
 BASE_DIR = Path(__file__).resolve().parent
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+templates = create_templates(BASE_DIR / "templates")
+templates.env.template_class = TimedTemplate
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
+app.mount(ASSETS_URL, ImmutableStaticFiles(directory=STATIC_BUILD_DIR, check_dir=False), name="assets")
+templates.env.globals["page_url"] = page_url
+templates.env.globals["static_url"] = static_url
 
 # Helper functions
 def get_week_dates(selected_date=None):
@@ -36,38 +98,66 @@ def get_week_dates(selected_date=None):
     
     return start_date, end_date
 
+def get_report_dates(start_date=None, end_date=None):
+    """Parse report date filters, defaulting to the current month"""
+    today = date.today()
+    
+    if start_date:
+        start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+    else:
+        start_date = date(today.year, today.month, 1)
+    
+    if end_date:
+        end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
+    else:
+        # Last day of current month
+        if today.month == 12:
+            end_date = date(today.year + 1, 1, 1) - timedelta(days=1)
+        else:
+            end_date = date(today.year, today.month + 1, 1) - timedelta(days=1)
+    
+    return start_date, end_date
+
+def get_date_filters(column, start_date=None, end_date=None):
+    """Build filters for an optional YYYY-MM-DD date range on a column"""
+    filters = []
+    try:
+        if start_date:
+            filters.append(column >= datetime.strptime(start_date, "%Y-%m-%d").date())
+        if end_date:
+            filters.append(column <= datetime.strptime(end_date, "%Y-%m-%d").date())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date filter")
+    return filters
+
+def get_page(query, date_column, id_column, cursor=None, descending=True):
+    """Get one keyset page of a query, rejecting malformed cursors"""
+    try:
+        return keyset_page(query, date_column, id_column, cursor, descending=descending)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid page cursor")
+
 # Routes
 @app.get("/")
-async def root(request: Request, db: Session = Depends(get_db)):
+@db_route
+def root(request: Request, db: Session = Depends(get_read_db)):
     """Dashboard with summary data"""
     # Get current month data
     today = date.today()
-    start_date = date(today.year, today.month, 1)
-    if today.month == 12:
-        end_date = date(today.year + 1, 1, 1) - timedelta(days=1)
-    else:
-        end_date = date(today.year, today.month + 1, 1) - timedelta(days=1)
     
-    # Payroll total for current month
-    payments = db.query(models.Payment).filter(
-        models.Payment.payment_date >= start_date,
-        models.Payment.payment_date <= end_date
-    ).all()
-    payroll_total = sum(payment.amount for payment in payments)
+    # Answer revalidations from the change counters alone; the page also
+    # changes with the date, so it is never older than today
+    table_versions, last_modified = versions.snapshot(db)
+    last_modified = http_cache.not_before_today(last_modified)
+    etag = http_cache.etag(request, table_versions, today, http_cache.RENDER_VERSION)
+    if http_cache.is_not_modified(request, etag, last_modified):
+        return http_cache.not_modified(etag, last_modified)
     
-    # Invoice total for current month
-    invoices = db.query(models.Invoice).filter(
-        models.Invoice.invoice_date >= start_date,
-        models.Invoice.invoice_date <= end_date
-    ).all()
-    invoice_total = sum(invoice.amount_charged for invoice in invoices)
-    
-    # Expense total for current month
-    expenses = db.query(models.Expense).filter(
-        models.Expense.expense_date >= start_date,
-        models.Expense.expense_date <= end_date
-    ).all()
-    expense_total = sum(expense.amount for expense in expenses)
+    # Payroll, invoice and expense totals for current month
+    month_totals = summary.month_totals(db, today)
+    payroll_total = month_totals["payroll_total"]
+    invoice_total = month_totals["invoice_total"]
+    expense_total = month_totals["expense_total"]
     
     # Upcoming payments (due in the next 30 days)
     upcoming_date = today + timedelta(days=30)
@@ -86,7 +176,9 @@ async def root(request: Request, db: Session = Depends(get_db)):
     recent_activity = []
     
     # Add payments
-    for payment in db.query(models.Payment).order_by(models.Payment.payment_date.desc()).limit(5).all():
+    for payment in db.query(models.Payment).options(
+        joinedload(models.Payment.employee)
+    ).order_by(models.Payment.payment_date.desc()).limit(5).all():
         recent_activity.append({
             "type": "payment",
             "date": payment.payment_date,
@@ -95,7 +187,9 @@ async def root(request: Request, db: Session = Depends(get_db)):
         })
     
     # Add invoices
-    for invoice in db.query(models.Invoice).order_by(models.Invoice.invoice_date.desc()).limit(5).all():
+    for invoice in db.query(models.Invoice).options(
+        joinedload(models.Invoice.project)
+    ).order_by(models.Invoice.invoice_date.desc()).limit(5).all():
         recent_activity.append({
             "type": "invoice",
             "date": invoice.invoice_date,
@@ -136,12 +230,14 @@ async def root(request: Request, db: Session = Depends(get_db)):
             "upcoming_payables": upcoming_payables,
             "active_projects": active_projects,
             "recent_activity": recent_activity
-        }
+        },
+        headers=http_cache.headers(etag, last_modified)
     )
 
 # Employee Management
 @app.get("/employees")
-async def employees_page(request: Request, db: Session = Depends(get_db)):
+@db_route
+def employees_page(request: Request, db: Session = Depends(get_read_db)):
     """Display list of employees with add/edit forms"""
     employees = db.query(models.Employee).all()
     return templates.TemplateResponse(
@@ -150,7 +246,8 @@ async def employees_page(request: Request, db: Session = Depends(get_db)):
     )
 
 @app.post("/employees")
-async def add_update_employee(
+@db_route
+def add_update_employee(
     request: Request,
     employee_id: Optional[int] = Form(None),
     name: str = Form(...),
@@ -208,7 +305,8 @@ async def add_update_employee(
         )
 
 @app.post("/employees/delete/{employee_id}")
-async def delete_employee(employee_id: int, db: Session = Depends(get_db)):
+@db_route
+def delete_employee(employee_id: int, db: Session = Depends(get_db)):
     """Delete an employee"""
     try:
         employee = db.query(models.Employee).filter(models.Employee.id == employee_id).first()
@@ -245,10 +343,13 @@ async def delete_employee(employee_id: int, db: Session = Depends(get_db)):
 
 # Work Log Entry
 @app.get("/worklogs")
-async def worklogs_page(request: Request, db: Session = Depends(get_db)):
+@db_route
+def worklogs_page(request: Request, db: Session = Depends(get_read_db)):
     """Form for entering work logs"""
     employees = db.query(models.Employee).all()
-    worklogs = db.query(models.WorkLog).order_by(models.WorkLog.date.desc()).limit(20).all()
+    worklogs = db.query(models.WorkLog).options(
+        joinedload(models.WorkLog.employee)
+    ).order_by(models.WorkLog.date.desc()).limit(20).all()
     
     return templates.TemplateResponse(
         "worklogs.html", 
@@ -262,7 +363,8 @@ async def worklogs_page(request: Request, db: Session = Depends(get_db)):
     )
 
 @app.post("/worklogs")
-async def add_worklog(
+@db_route
+def add_worklog(
     request: Request,
     employee_id: int = Form(...),
     log_date: date = Form(...),
@@ -273,8 +375,13 @@ async def add_worklog(
 ):
     """Save work log"""
     # Convert string times to time objects
-    entry_time_obj = datetime.strptime(entry_time, "%H:%M").time()
-    exit_time_obj = datetime.strptime(exit_time, "%H:%M").time()
+    try:
+        entry_time_obj = parse_time(entry_time)
+        exit_time_obj = parse_time(exit_time)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid time format")
+    if entry_time_obj is None or exit_time_obj is None:
+        raise HTTPException(status_code=400, detail="Entry and exit times are required")
     
     worklog = models.WorkLog(
         employee_id=employee_id,
@@ -284,13 +391,64 @@ async def add_worklog(
         lunch_duration=lunch_duration
     )
     
+    # Store hours and gross pay at the employee's current rate
+    employee = db.query(models.Employee).filter(models.Employee.id == employee_id).first()
+    worklog.set_totals(employee.hourly_rate if employee else 0)
+    
     db.add(worklog)
     db.commit()
     
     return RedirectResponse(url="/worklogs", status_code=303)
 
+@app.post("/worklogs/import")
+@db_route
+def import_worklogs_csv(
+    request: Request,
+    file: UploadFile = File(...),
+    dry_run: bool = Form(False),
+    db: Session = Depends(get_db)
+):
+    """Import work logs from a timesheet CSV in one transaction"""
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        import_result = import_worklogs(db, stream, dry_run=dry_run)
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    except UnicodeDecodeError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="Timesheet is not UTF-8 encoded text; save it as a UTF-8 CSV and upload it again"
+        )
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        stream.detach()
+    
+    employees = db.query(models.Employee).all()
+    worklogs = db.query(models.WorkLog).options(
+        joinedload(models.WorkLog.employee)
+    ).order_by(models.WorkLog.date.desc()).limit(20).all()
+    
+    return templates.TemplateResponse(
+        "worklogs.html", 
+        {
+            "request": request, 
+            "employees": employees, 
+            "worklogs": worklogs,
+            "today": date.today(),
+            "import_result": import_result,
+            "active_page": "worklogs"
+        },
+        status_code=422 if import_result["invalid"] and not import_result["valid"] else 200
+    )
+
 @app.post("/worklogs/delete/{worklog_id}")
-async def delete_worklog(worklog_id: int, db: Session = Depends(get_db)):
+@db_route
+def delete_worklog(worklog_id: int, db: Session = Depends(get_db)):
     """Delete a work log"""
     worklog = db.query(models.WorkLog).filter(models.WorkLog.id == worklog_id).first()
     if not worklog:
@@ -303,10 +461,12 @@ async def delete_worklog(worklog_id: int, db: Session = Depends(get_db)):
 
 # Payroll Processing
 @app.get("/payroll")
-async def payroll_page(
+@db_route
+def payroll_page(
     request: Request, 
     week_date: Optional[str] = None,
-    db: Session = Depends(get_db)
+    view: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
     """Display work logs for a week and calculate payroll"""
     if week_date:
@@ -316,36 +476,26 @@ async def payroll_page(
     
     start_date, end_date = get_week_dates(selected_date)
     
-    # Get all employees
-    employees = db.query(models.Employee).all()
+    # Calculate payroll for all employees for the selected week
+    payroll_data = calculate_payroll(db, start_date, end_date)
     
-    # Calculate payroll for each employee for the selected week
-    payroll_data = []
-    for employee in employees:
-        worklogs = db.query(models.WorkLog).filter(
-            models.WorkLog.employee_id == employee.id,
-            models.WorkLog.date >= start_date,
-            models.WorkLog.date <= end_date
-        ).all()
-        
-        total_hours = sum(worklog.hours_worked for worklog in worklogs)
-        amount_due = total_hours * employee.hourly_rate
-        
-        payroll_data.append({
-            "employee": employee,
-            "worklogs": worklogs,
-            "total_hours": total_hours,
-            "amount_due": amount_due
-        })
+    # Optional per-day breakdown for the same week
+    daily_data = None
+    if view == "daily":
+        daily_data = calculate_daily_payroll(db, start_date, end_date)
     
     # Get recent payments
-    recent_payments = db.query(models.Payment).order_by(models.Payment.payment_date.desc()).limit(10).all()
+    recent_payments = db.query(models.Payment).options(
+        joinedload(models.Payment.employee)
+    ).order_by(models.Payment.payment_date.desc()).limit(10).all()
     
     return templates.TemplateResponse(
         "payroll.html", 
         {
             "request": request, 
             "payroll_data": payroll_data,
+            "daily_data": daily_data,
+            "view": view,
             "start_date": start_date,
             "end_date": end_date,
             "selected_date": selected_date,
@@ -355,7 +505,8 @@ async def payroll_page(
     )
 
 @app.post("/payroll")
-async def process_payment(
+@db_route
+def process_payment(
     request: Request,
     employee_id: int = Form(...),
     amount: float = Form(...),
@@ -374,22 +525,27 @@ async def process_payment(
     )
     
     db.add(payment)
+    summary.record(db, "payroll", payment_date, amount)
     db.commit()
     
     return RedirectResponse(url="/payroll", status_code=303)
 
 # Project Management
 @app.get("/projects")
-async def projects_page(request: Request, db: Session = Depends(get_db)):
+@db_route
+def projects_page(request: Request, db: Session = Depends(get_read_db)):
     """List projects with add/edit forms and cost entry"""
-    projects = db.query(models.Project).all()
+    projects = db.query(models.Project).options(
+        selectinload(models.Project.costs)
+    ).all()
     return templates.TemplateResponse(
         "projects.html", 
         {"request": request, "projects": projects, "active_page": "projects"}
     )
 
 @app.post("/projects")
-async def add_update_project(
+@db_route
+def add_update_project(
     request: Request,
     project_id: Optional[int] = Form(None),
     name: str = Form(...),
@@ -421,7 +577,8 @@ async def add_update_project(
     return RedirectResponse(url="/projects", status_code=303)
 
 @app.post("/projects/delete/{project_id}")
-async def delete_project(project_id: int, db: Session = Depends(get_db)):
+@db_route
+def delete_project(project_id: int, db: Session = Depends(get_db)):
     """Delete a project"""
     project = db.query(models.Project).filter(models.Project.id == project_id).first()
     if not project:
@@ -432,7 +589,8 @@ async def delete_project(project_id: int, db: Session = Depends(get_db)):
     return RedirectResponse(url="/projects", status_code=303)
 
 @app.post("/project_costs")
-async def add_project_cost(
+@db_route
+def add_project_cost(
     request: Request,
     project_id: int = Form(...),
     cost_type: str = Form(...),
@@ -449,28 +607,51 @@ async def add_project_cost(
     )
     
     db.add(cost)
+    rollups.adjust_project(db, project_id, costs=amount)
     db.commit()
     
     return RedirectResponse(url="/projects", status_code=303)
 
 @app.post("/project_costs/delete/{cost_id}")
-async def delete_project_cost(cost_id: int, db: Session = Depends(get_db)):
+@db_route
+def delete_project_cost(cost_id: int, db: Session = Depends(get_db)):
     """Delete a project cost"""
     cost = db.query(models.ProjectCost).filter(models.ProjectCost.id == cost_id).first()
     if not cost:
         raise HTTPException(status_code=404, detail="Project cost not found")
     
     db.delete(cost)
+    rollups.adjust_project(db, cost.project_id, costs=-cost.amount)
     db.commit()
     
     return RedirectResponse(url="/projects", status_code=303)
 
 # Invoicing
 @app.get("/invoices")
-async def invoices_page(request: Request, db: Session = Depends(get_db)):
+@db_route
+def invoices_page(
+    request: Request,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    project_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
     """Form to select project and enter invoice details"""
     projects = db.query(models.Project).all()
-    invoices = db.query(models.Invoice).order_by(models.Invoice.invoice_date.desc()).all()
+    
+    # Filter invoices, then page through them newest first
+    filters = get_date_filters(models.Invoice.invoice_date, start_date, end_date)
+    if project_id:
+        if not project_id.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid project filter")
+        filters.append(models.Invoice.project_id == int(project_id))
+    query = db.query(models.Invoice).filter(*filters)
+    
+    invoices, next_cursor = get_page(
+        query.options(joinedload(models.Invoice.project)),
+        models.Invoice.invoice_date, models.Invoice.id, cursor
+    )
     
     return templates.TemplateResponse(
         "invoices.html", 
@@ -478,12 +659,16 @@ async def invoices_page(request: Request, db: Session = Depends(get_db)):
             "request": request, 
             "projects": projects, 
             "invoices": invoices,
+            "invoice_totals": totals(query, models.Invoice.amount_charged),
+            "next_cursor": next_cursor,
+            "filters": {"start_date": start_date, "end_date": end_date, "project_id": project_id},
             "active_page": "invoices"
         }
     )
 
 @app.post("/invoices")
-async def add_invoice(
+@db_route
+def add_invoice(
     request: Request,
     project_id: int = Form(...),
     amount_charged: float = Form(...),
@@ -498,29 +683,82 @@ async def add_invoice(
     )
     
     db.add(invoice)
+    rollups.adjust_project(db, project_id, invoiced=amount_charged)
+    summary.record(db, "invoice", invoice_date, amount_charged)
     db.commit()
     
     return RedirectResponse(url="/invoices", status_code=303)
 
 @app.post("/invoices/delete/{invoice_id}")
-async def delete_invoice(invoice_id: int, db: Session = Depends(get_db)):
+@db_route
+def delete_invoice(invoice_id: int, db: Session = Depends(get_db)):
     """Delete an invoice"""
     invoice = db.query(models.Invoice).filter(models.Invoice.id == invoice_id).first()
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     
     db.delete(invoice)
+    rollups.adjust_project(db, invoice.project_id, invoiced=-invoice.amount_charged)
+    summary.record(db, "invoice", invoice.invoice_date, -invoice.amount_charged)
     db.commit()
     
     return RedirectResponse(url="/invoices", status_code=303)
 
 # Financial Management
 @app.get("/financials")
-async def financials_page(request: Request, db: Session = Depends(get_db)):
+@db_route
+def financials_page(
+    request: Request,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    supplier: Optional[str] = None,
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    method: Optional[str] = None,
+    tab: str = "payables",
+    payables_cursor: Optional[str] = None,
+    paid_cursor: Optional[str] = None,
+    expenses_cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
     """Tabs or sections for Accounts Payable, Paid Accounts, Expenses"""
-    payables = db.query(models.AccountsPayable).all()
-    paid_accounts = db.query(models.PaidAccount).all()
-    expenses = db.query(models.Expense).all()
+    # Accounts payable: soonest due first
+    filters = get_date_filters(models.AccountsPayable.due_date, start_date, end_date)
+    if supplier:
+        filters.append(models.AccountsPayable.supplier == supplier)
+    if category:
+        filters.append(models.AccountsPayable.category == category)
+    if status:
+        filters.append(models.AccountsPayable.status == status)
+    if method:
+        filters.append(models.AccountsPayable.payment_method == method)
+    payables_query = db.query(models.AccountsPayable).filter(*filters)
+    payables, payables_next = get_page(
+        payables_query, models.AccountsPayable.due_date, models.AccountsPayable.id,
+        payables_cursor, descending=False
+    )
+    
+    # Paid accounts: most recent first
+    filters = get_date_filters(models.PaidAccount.payment_date, start_date, end_date)
+    if supplier:
+        filters.append(models.PaidAccount.supplier == supplier)
+    if method:
+        filters.append(models.PaidAccount.payment_method == method)
+    paid_query = db.query(models.PaidAccount).filter(*filters)
+    paid_accounts, paid_next = get_page(
+        paid_query, models.PaidAccount.payment_date, models.PaidAccount.id, paid_cursor
+    )
+    
+    # Expenses: most recent first
+    filters = get_date_filters(models.Expense.expense_date, start_date, end_date)
+    if category:
+        filters.append(models.Expense.category == category)
+    if method:
+        filters.append(models.Expense.payment_method == method)
+    expenses_query = db.query(models.Expense).filter(*filters)
+    expenses, expenses_next = get_page(
+        expenses_query, models.Expense.expense_date, models.Expense.id, expenses_cursor
+    )
     
     return templates.TemplateResponse(
         "financials.html", 
@@ -529,12 +767,24 @@ async def financials_page(request: Request, db: Session = Depends(get_db)):
             "payables": payables, 
             "paid_accounts": paid_accounts,
             "expenses": expenses,
+            "payables_totals": totals(payables_query, models.AccountsPayable.amount),
+            "paid_totals": totals(paid_query, models.PaidAccount.amount_paid),
+            "expenses_totals": totals(expenses_query, models.Expense.amount),
+            "payables_next": payables_next,
+            "paid_next": paid_next,
+            "expenses_next": expenses_next,
+            "filters": {
+                "start_date": start_date, "end_date": end_date, "supplier": supplier,
+                "category": category, "status": status, "method": method
+            },
+            "tab": tab,
             "active_page": "financials"
         }
     )
 
 @app.post("/financials/payables")
-async def add_payable(
+@db_route
+def add_payable(
     request: Request,
     supplier: str = Form(...),
     description: str = Form(...),
@@ -564,7 +814,8 @@ async def add_payable(
     return RedirectResponse(url="/financials", status_code=303)
 
 @app.post("/financials/paid")
-async def add_paid_account(
+@db_route
+def add_paid_account(
     request: Request,
     supplier: str = Form(...),
     amount_paid: float = Form(...),
@@ -589,12 +840,14 @@ async def add_paid_account(
     )
     
     db.add(paid_account)
+    summary.record(db, "paid", payment_date, amount_paid)
     db.commit()
     
     return RedirectResponse(url="/financials", status_code=303)
 
 @app.post("/financials/expenses")
-async def add_expense(
+@db_route
+def add_expense(
     request: Request,
     description: str = Form(...),
     amount: float = Form(...),
@@ -615,12 +868,14 @@ async def add_expense(
     )
     
     db.add(expense)
+    summary.record(db, "expense", expense_date, amount)
     db.commit()
     
     return RedirectResponse(url="/financials", status_code=303)
 
 @app.post("/financials/delete/{type}/{item_id}")
-async def delete_financial_item(type: str, item_id: int, db: Session = Depends(get_db)):
+@db_route
+def delete_financial_item(type: str, item_id: int, db: Session = Depends(get_db)):
     """Delete specific financial entry"""
     if type == "payable":
         item = db.query(models.AccountsPayable).filter(models.AccountsPayable.id == item_id).first()
@@ -635,231 +890,45 @@ async def delete_financial_item(type: str, item_id: int, db: Session = Depends(g
         raise HTTPException(status_code=404, detail="Item not found")
     
     db.delete(item)
+    if type == "paid":
+        summary.record(db, "paid", item.payment_date, -item.amount_paid)
+    elif type == "expense":
+        summary.record(db, "expense", item.expense_date, -item.amount)
     db.commit()
     
     return RedirectResponse(url="/financials", status_code=303)
 
 # Reports
 @app.get("/reports")
-async def reports_page(
+@db_route
+def reports_page(
     request: Request, 
     report_type: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Navigation to all reports with date range filters"""
-    # Default to current month if no dates provided
-    if not start_date:
-        today = date.today()
-        start_date = date(today.year, today.month, 1).isoformat()
-    
-    if not end_date:
-        today = date.today()
-        # Last day of current month
-        if today.month == 12:
-            end_date = date(today.year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = date(today.year, today.month + 1, 1) - timedelta(days=1)
-        end_date = end_date.isoformat()
-    
-    # Convert string dates to date objects
-    start_date_obj = datetime.strptime(start_date, "%Y-%m-%d").date()
-    end_date_obj = datetime.strptime(end_date, "%Y-%m-%d").date()
+    start_date_obj, end_date_obj = get_report_dates(start_date, end_date)
+    start_date = start_date_obj.isoformat()
+    end_date = end_date_obj.isoformat()
+    
+    # Answer revalidations from the report's change counters alone; default
+    # dates depend on the current day, which the ETag therefore includes
+    table_versions, last_modified = versions.snapshot(db, REPORT_TABLES.get(report_type, ()))
+    last_modified = http_cache.not_before_today(last_modified)
+    etag = http_cache.etag(request, table_versions, start_date, end_date, http_cache.RENDER_VERSION)
+    if http_cache.is_not_modified(request, etag, last_modified):
+        return http_cache.not_modified(etag, last_modified)
     
     report_data = None
-    
-    if report_type == "payroll":
-        # Payroll Report
-        payments = db.query(models.Payment).filter(
-            models.Payment.payment_date >= start_date_obj,
-            models.Payment.payment_date <= end_date_obj
-        ).order_by(models.Payment.payment_date).all()
-        
-        report_data = {
-            "payments": payments,
-            "total": sum(payment.amount for payment in payments)
-        }
-    
-    elif report_type == "payment_method":
-        # Payment Method Report
-        payments = db.query(models.Payment).filter(
-            models.Payment.payment_date >= start_date_obj,
-            models.Payment.payment_date <= end_date_obj
-        ).all()
-        
-        cash_total = sum(payment.amount for payment in payments if payment.payment_method == "cash")
-        check_total = sum(payment.amount for payment in payments if payment.payment_method == "check")
-        
-        report_data = {
-            "cash_total": cash_total,
-            "check_total": check_total,
-            "total": cash_total + check_total
-        }
-    
-    elif report_type == "hours_worked":
-        # Hours Worked Report
-        employees = db.query(models.Employee).all()
-        hours_data = []
-        
-        for employee in employees:
-            worklogs = db.query(models.WorkLog).filter(
-                models.WorkLog.employee_id == employee.id,
-                models.WorkLog.date >= start_date_obj,
-                models.WorkLog.date <= end_date_obj
-            ).all()
-            
-            total_hours = sum(worklog.hours_worked for worklog in worklogs)
-            
-            hours_data.append({
-                "employee": employee,
-                "total_hours": total_hours
-            })
-        
-        report_data = {"hours_data": hours_data}
-    
-    elif report_type == "project_billing":
-        # Project Billing Report
-        projects = db.query(models.Project).all()
-        billing_data = []
-        
-        for project in projects:
-            invoices = db.query(models.Invoice).filter(
-                models.Invoice.project_id == project.id,
-                models.Invoice.invoice_date >= start_date_obj,
-                models.Invoice.invoice_date <= end_date_obj
-            ).all()
-            
-            total_invoiced = sum(invoice.amount_charged for invoice in invoices)
-            
-            billing_data.append({
-                "project": project,
-                "total_invoiced": total_invoiced,
-                "total_costs": project.total_costs,
-                "profit": total_invoiced - project.total_costs
-            })
-        
-        report_data = {"billing_data": billing_data}
-    
-    elif report_type == "project_cost":
-        # Project Cost Report
-        projects = db.query(models.Project).all()
-        cost_data = []
-        
-        for project in projects:
-            material_costs = sum(cost.amount for cost in project.costs if cost.cost_type == "material")
-            employee_costs = sum(cost.amount for cost in project.costs if cost.cost_type == "employee")
-            
-            cost_data.append({
-                "project": project,
-                "material_costs": material_costs,
-                "employee_costs": employee_costs,
-                "total_costs": material_costs + employee_costs
-            })
-        
-        report_data = {"cost_data": cost_data}
-    
-    elif report_type == "project_profit":
-        # Project Profit Margin Report
-        projects = db.query(models.Project).all()
-        profit_data = []
-        
-        for project in projects:
-            invoices = db.query(models.Invoice).filter(models.Invoice.project_id == project.id).all()
-            total_invoiced = sum(invoice.amount_charged for invoice in invoices)
-            
-            profit_data.append({
-                "project": project,
-                "total_invoiced": total_invoiced,
-                "total_costs": project.total_costs,
-                "profit_margin": total_invoiced - project.total_costs,
-                "profit_percentage": (total_invoiced - project.total_costs) / total_invoiced * 100 if total_invoiced > 0 else 0
-            })
-        
-        report_data = {"profit_data": profit_data}
-    
-    elif report_type == "accounts_payable":
-        # Accounts Payable Report
-        payables = db.query(models.AccountsPayable).filter(
-            models.AccountsPayable.due_date >= start_date_obj,
-            models.AccountsPayable.due_date <= end_date_obj,
-            models.AccountsPayable.status == "pending"
-        ).order_by(models.AccountsPayable.due_date).all()
-        
-        report_data = {
-            "payables": payables,
-            "total": sum(payable.amount for payable in payables)
-        }
-    
-    elif report_type == "paid_accounts":
-        # Paid Accounts Report
-        paid_accounts = db.query(models.PaidAccount).filter(
-            models.PaidAccount.payment_date >= start_date_obj,
-            models.PaidAccount.payment_date <= end_date_obj
-        ).order_by(models.PaidAccount.payment_date).all()
-        
-        report_data = {
-            "paid_accounts": paid_accounts,
-            "total": sum(account.amount_paid for account in paid_accounts)
-        }
-    
-    elif report_type == "monthly_expense":
-        # Monthly Expense Report
-        expenses = db.query(models.Expense).filter(
-            models.Expense.expense_date >= start_date_obj,
-            models.Expense.expense_date <= end_date_obj
-        ).order_by(models.Expense.expense_date).all()
-        
-        # Group by category
-        categories = {}
-        for expense in expenses:
-            if expense.category not in categories:
-                categories[expense.category] = 0
-            categories[expense.category] += expense.amount
-        
-        report_data = {
-            "expenses": expenses,
-            "categories": categories,
-            "total": sum(expense.amount for expense in expenses)
-        }
-    
-    elif report_type == "paid_by_method":
-        # Paid Accounts by Payment Method
-        paid_accounts = db.query(models.PaidAccount).filter(
-            models.PaidAccount.payment_date >= start_date_obj,
-            models.PaidAccount.payment_date <= end_date_obj
-        ).all()
-        
-        methods = {}
-        for account in paid_accounts:
-            if account.payment_method not in methods:
-                methods[account.payment_method] = 0
-            methods[account.payment_method] += account.amount_paid
-        
-        report_data = {
-            "methods": methods,
-            "total": sum(account.amount_paid for account in paid_accounts)
-        }
-    
-    elif report_type == "payment_forecast":
-        # Payment Forecast
-        payables = db.query(models.AccountsPayable).filter(
-            models.AccountsPayable.status == "pending"
-        ).order_by(models.AccountsPayable.due_date).all()
-        
-        # Group by month
-        forecast = {}
-        for payable in payables:
-            month_key = f"{payable.due_date.year}-{payable.due_date.month:02d}"
-            if month_key not in forecast:
-                forecast[month_key] = 0
-            forecast[month_key] += payable.amount
-        
-        report_data = {
-            "payables": payables,
-            "forecast": forecast,
-            "total": sum(payable.amount for payable in payables)
-        }
+    if report_type in REPORT_TABLES:
+        # Reuse cached data unless one of the report's tables changed since
+        cache_key = (report_type, start_date_obj, end_date_obj)
+        report_data = report_cache.get(cache_key, table_versions)
+        if report_data is None:
+            report_data = build_report(db, report_type, start_date_obj, end_date_obj)
+            report_cache.set(cache_key, table_versions, report_data)
     
     return templates.TemplateResponse(
         "reports.html", 
@@ -870,9 +939,45 @@ async def reports_page(
             "end_date": end_date,
             "report_data": report_data,
             "active_page": "reports"
-        }
+        },
+        headers=http_cache.headers(etag, last_modified)
+    )
+
+@app.get("/reports/export")
+@db_route
+def export_report_page(
+    report_type: str,
+    format: str = "csv",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Stream a report as CSV or NDJSON"""
+    if report_type not in EXPORT_COLUMNS:
+        raise HTTPException(status_code=400, detail="Invalid report type")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid export format")
+    
+    start_date_obj, end_date_obj = get_report_dates(start_date, end_date)
+    filename = f"{report_type}_{start_date_obj.isoformat()}_{end_date_obj.isoformat()}.{format}"
+    
+    return StreamingResponse(
+        export_report(db, report_type, format, start_date_obj, end_date_obj),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
+@app.get("/reports/cache")
+async def report_cache_stats():
+    """Report cache counters (hits, misses, evictions, memory) for sizing"""
+    return report_cache.stats()
+
+@app.get("/metrics")
+async def metrics_page():
+    """Prometheus metrics, added up across all worker processes"""
+    content, content_type = metrics.render()
+    return Response(content=content, media_type=content_type)
+
 # Documentation
 @app.get("/documentation")
 async def documentation_page(request: Request):
@@ -0,0 +1,213 @@
+"""
+Fingerprinted static assets
+
+`build` downloads the vendored libraries (VENDOR_ASSETS) into
+static/vendor/ and checks each against the sha256 pinned for it in
+vendor.lock.json, failing on a missing, unpinned or altered file. It
+then copies every file under static/ to STATIC_BUILD_DIR
+with a content hash in its name (css/style.css -> css/style.1a2b3c4d5e6f.css)
+and writes a manifest mapping the two. Hashed files are served under
+/assets with immutable cache headers: their content never changes under a
+given name, so browsers never revalidate them.
+
+Templates link assets through static_url(), which returns the hashed URL
+when a build exists and falls back to /static (or the CDN for vendored
+libraries not downloaded yet) otherwise.
+
+`pin` downloads the vendored libraries and records their sha256 in
+vendor.lock.json; run it (and commit the file) whenever a URL changes.
+
+Usage:
+    python -m construction_erp.assets build
+    python -m construction_erp.assets pin
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import urllib.request
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+from fastapi.staticfiles import StaticFiles
+
+from construction_erp.config import STATIC_BUILD_DIR
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+VENDOR_PINS = Path(__file__).resolve().parent / "vendor.lock.json"
+MANIFEST_NAME = "manifest.json"
+ASSETS_URL = "/assets"
+
+# Third-party files served from static/vendor/: path -> download URL
+# (the sha256 of each is pinned in vendor.lock.json)
+VENDOR_ASSETS = {
+    "vendor/chart.min.js": "https://cdn.jsdelivr.net/npm/chart.js@3.7.1/dist/chart.min.js",
+}
+
+# Cache headers of hashed assets: one year, never revalidated
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for content-hashed files, cached by browsers for good"""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+@lru_cache(maxsize=None)
+def manifest() -> Dict[str, str]:
+    """Source path -> hashed path of the current build, empty without a build"""
+    try:
+        with open(os.path.join(STATIC_BUILD_DIR, MANIFEST_NAME)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def static_url(path: str) -> str:
+    """URL of a static asset, fingerprinted when a build exists"""
+    path = path.lstrip("/")
+    hashed = manifest().get(path)
+    if hashed:
+        return f"{ASSETS_URL}/{hashed}"
+    if path in VENDOR_ASSETS and not (STATIC_DIR / path).exists():
+        return VENDOR_ASSETS[path]
+    return f"/static/{path}"
+
+
+def manifest_version() -> str:
+    """Short hash of the build manifest, changes whenever an asset changes"""
+    return hashlib.sha256(json.dumps(manifest(), sort_keys=True).encode()).hexdigest()[:16]
+
+
+def vendor_pins() -> Dict[str, str]:
+    """Vendored path -> pinned sha256, empty when nothing was pinned yet"""
+    try:
+        with open(VENDOR_PINS) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def _download(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return response.read()
+
+
+def _check_pin(path: str, content: bytes, pins: Dict[str, str]) -> None:
+    if path not in pins:
+        raise RuntimeError(
+            f"No sha256 pinned for {path}; run `python -m construction_erp.assets pin` and commit {VENDOR_PINS.name}"
+        )
+    digest = hashlib.sha256(content).hexdigest()
+    if digest != pins[path]:
+        raise RuntimeError(f"{path} has sha256 {digest}, expected {pins[path]} (pinned in {VENDOR_PINS.name})")
+
+
+def download_vendor_assets() -> int:
+    """Download vendored libraries that are not in static/vendor/ yet, rejecting unpinned content"""
+    pins = vendor_pins()
+    downloaded = 0
+    for path, url in VENDOR_ASSETS.items():
+        target = STATIC_DIR / path
+        if target.exists():
+            continue
+        content = _download(url)
+        _check_pin(path, content, pins)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        downloaded += 1
+    return downloaded
+
+
+def verify_vendor_assets() -> None:
+    """Raise RuntimeError unless every vendored library is present and matches its pin"""
+    pins = vendor_pins()
+    for path in VENDOR_ASSETS:
+        target = STATIC_DIR / path
+        if not target.exists():
+            raise RuntimeError(f"{path} is missing from {STATIC_DIR}; download it or place it there")
+        _check_pin(path, target.read_bytes(), pins)
+
+
+def pin_vendor_assets() -> Dict[str, str]:
+    """Download every vendored library and record its sha256 in vendor.lock.json"""
+    pins = {path: hashlib.sha256(_download(url)).hexdigest() for path, url in VENDOR_ASSETS.items()}
+    with open(VENDOR_PINS, "w") as file:
+        json.dump(pins, file, indent=2, sort_keys=True)
+        file.write("\n")
+    return pins
+
+
+def build(output: str = STATIC_BUILD_DIR) -> Dict[str, str]:
+    """Copy every static file to output under a content-hashed name"""
+    # Never build without the vendored libraries, pages would fall back to the CDN
+    verify_vendor_assets()
+
+    entries = {}
+    for source in sorted(STATIC_DIR.rglob("*")):
+        if not source.is_file():
+            continue
+        relative = source.relative_to(STATIC_DIR).as_posix()
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()[:12]
+        stem, dot, suffix = relative.rpartition(".")
+        hashed = f"{stem}.{digest}.{suffix}" if dot else f"{relative}.{digest}"
+
+        target = Path(output) / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source, target)
+        entries[relative] = hashed
+
+    with open(os.path.join(output, MANIFEST_NAME), "w") as file:
+        json.dump(entries, file, indent=2, sort_keys=True)
+    manifest.cache_clear()
+    return entries
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build fingerprinted static assets")
+    parser.add_argument("command", choices=["build", "pin"])
+    parser.add_argument("--output", default=STATIC_BUILD_DIR, help="directory to write hashed assets to")
+    parser.add_argument("--no-download", action="store_true",
+                        help="do not download vendored libraries missing from static/vendor/")
+    args = parser.parse_args(argv)
+
+    if args.command == "pin":
+        try:
+            pins = pin_vendor_assets()
+        except OSError as e:
+            print(f"Could not download vendored libraries ({e})")
+            return 1
+        for path, digest in pins.items():
+            print(f"{digest}  {path}")
+        print(f"Pinned {len(pins)} vendored libraries in {VENDOR_PINS}")
+        return 0
+
+    try:
+        if not args.no_download:
+            try:
+                downloaded = download_vendor_assets()
+            except OSError as e:
+                print(f"Could not download vendored libraries ({e}); "
+                      "place them in static/vendor/ or pass --no-download")
+                return 1
+            if downloaded:
+                print(f"Downloaded {downloaded} vendored libraries into {STATIC_DIR / 'vendor'}")
+        entries = build(args.output)
+    except RuntimeError as e:
+        # Missing, unpinned or altered vendored library
+        print(e)
+        return 1
+
+    print(f"Wrote {len(entries)} hashed assets and {MANIFEST_NAME} to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Bytes saved and CPU cost of response compression
+
+Fetches the largest pages uncompressed from a seeded database (see
+seed.py), then compresses each body with every available encoding and
+level, reporting compressed size, ratio and CPU time per response.
+
+Usage:
+    python -m construction_erp.benchmarks.compression [--db bench.db | --scale small]
+        [--repeat 5] [--output compression-results.json]
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from construction_erp.benchmarks.seed import SCALES, seed
+
+
+def pages(today: date):
+    year_range = f"start_date={(today - timedelta(days=365)).isoformat()}&end_date={today.isoformat()}"
+    return [
+        "/",
+        "/financials",
+        "/invoices",
+        "/reports?report_type=paid_accounts&" + year_range,
+        "/reports?report_type=monthly_expense&" + year_range,
+        "/reports/export?report_type=paid_accounts&format=csv&" + year_range,
+        "/api/expenses?limit=500",
+    ]
+
+
+def encoders():
+    """(name, compress function) for every encoding and level worth comparing"""
+    result = [(f"gzip-{level}", lambda body, level=level: gzip.compress(body, compresslevel=level, mtime=0))
+              for level in (1, 6, 9)]
+    try:
+        import brotli
+    except ImportError:
+        return result
+    result += [(f"br-{quality}", lambda body, quality=quality: brotli.compress(body, quality=quality))
+               for quality in (1, 4, 11)]
+    return result
+
+
+def cpu_ms(function, body: bytes, repeat: int) -> float:
+    started = time.process_time()
+    for _ in range(repeat):
+        function(body)
+    return (time.process_time() - started) / repeat * 1000
+
+
+def run(repeat: int) -> dict:
+    from fastapi.testclient import TestClient
+    from construction_erp.app import app
+
+    results = {}
+    with TestClient(app) as client:
+        for path in pages(date.today()):
+            body = client.get(path, headers={"Accept-Encoding": "identity"}).content
+            result = {"bytes": len(body), "encodings": {}}
+            for name, function in encoders():
+                size = len(function(body))
+                result["encodings"][name] = {
+                    "bytes": size,
+                    "saved_bytes": len(body) - size,
+                    "ratio": round(size / len(body), 4) if body else 1.0,
+                    "cpu_ms": round(cpu_ms(function, body, repeat), 3),
+                }
+            results[path] = result
+
+            summary = "  ".join(
+                f"{name} {item['ratio'] * 100:5.1f}% {item['cpu_ms']:7.2f}ms"
+                for name, item in result["encodings"].items()
+            )
+            print(f"{len(body):>10} bytes  {summary}  {path}")
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", help="existing seeded database, a temporary one is seeded otherwise")
+    parser.add_argument("--scale", choices=SCALES, default="small", help="scale of the temporary database")
+    parser.add_argument("--repeat", type=int, default=5, help="compressions timed per body and encoding")
+    parser.add_argument("--output", default="compression-results.json", help="results file to write")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.db
+        if not path:
+            path = os.path.join(directory, "benchmark.db")
+            seed(path, SCALES[args.scale])
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+        results = run(args.repeat)
+
+    with open(args.output, "w") as output:
+        json.dump({"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "pages": results}, output, indent=2)
+    print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Concurrent request latency with blocking vs. offloaded database access
+
+Seeds a temporary database, then for each DB_EXECUTION_MODE fires slow
+requests (/financials over many rows) together with fast ones (/employees)
+at an in-process app and reports latency of both. With "inline" the slow
+queries block the event loop and fast requests queue behind them; with
+"threadpool" they run side by side.
+
+Usage:
+    python -m construction_erp.benchmarks.concurrency [--rows 5000] [--slow 4] [--fast 40]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+
+def seed(path: str, rows: int) -> None:
+    """Create the schema and fill the financial tables with plain sqlite3"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    from construction_erp.migrations import upgrade
+    upgrade()
+
+    start = date(2020, 1, 1)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO employees (name, hourly_rate) VALUES (?, ?)",
+        [(f"Employee {i}", 20 + i % 15) for i in range(50)],
+    )
+    conn.executemany(
+        "INSERT INTO expenses (description, amount, expense_date, category, payment_method) VALUES (?, ?, ?, ?, ?)",
+        [(f"Expense {i}", 10 + i % 500, (start + timedelta(days=i % 1500)).isoformat(), "Materials", "cash")
+         for i in range(rows)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def measure(slow: int, fast: int) -> dict:
+    import httpx
+    from construction_erp.app import app
+
+    async with httpx.AsyncClient(app=app, base_url="http://benchmark") as client:
+        async def timed(path):
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            return time.perf_counter() - started
+
+        # Warm up templates and connections
+        await timed("/employees")
+
+        started = time.perf_counter()
+        slow_tasks = [asyncio.create_task(timed("/financials")) for _ in range(slow)]
+        await asyncio.sleep(0)
+        fast_latencies = await asyncio.gather(*(timed("/employees") for _ in range(fast)))
+        slow_latencies = await asyncio.gather(*slow_tasks)
+        wall = time.perf_counter() - started
+
+    return {
+        "fast_p50_ms": round(statistics.median(fast_latencies) * 1000, 1),
+        "fast_p95_ms": round(percentile(fast_latencies, 0.95) * 1000, 1),
+        "slow_p50_ms": round(statistics.median(slow_latencies) * 1000, 1),
+        "wall_ms": round(wall * 1000, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=5000, help="expense rows to seed")
+    parser.add_argument("--slow", type=int, default=4, help="concurrent slow requests")
+    parser.add_argument("--fast", type=int, default=40, help="concurrent fast requests")
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        # Child process: the mode is read from the environment at import time
+        result = asyncio.run(measure(args.slow, args.fast))
+        print(json.dumps(result))
+        return 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmark.db")
+        seed(path, args.rows)
+
+        for mode in ("inline", "threadpool"):
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", DB_EXECUTION_MODE=mode)
+            output = subprocess.run(
+                [sys.executable, "-m", "construction_erp.benchmarks.concurrency",
+                 "--mode", mode, "--slow", str(args.slow), "--fast", str(args.fast)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:>10}: " + ", ".join(f"{key}={value}" for key, value in result.items()))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
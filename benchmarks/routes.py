@@ -0,0 +1,180 @@
+"""
+Latency and query counts of every GET route, report type and API endpoint
+
+Runs each page against a seeded database (see seed.py) with an in-process
+client and records p50/p95 latency and the number of SQL statements per
+request. Results are written as JSON so runs from different commits can be
+compared with --compare.
+
+Usage:
+    python -m construction_erp.benchmarks.routes [--db bench.db | --scale small]
+        [--iterations 10] [--output benchmark-results.json] [--compare old.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+from construction_erp.benchmarks.seed import SCALES, seed
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def benchmark_paths(today: date) -> List[str]:
+    """Every GET page, each report type over the last year and its export, and the JSON API"""
+    from construction_erp.api import ENTITIES, MAX_LIMIT
+    from construction_erp.reports import REPORT_TABLES
+
+    year_range = f"start_date={(today - timedelta(days=365)).isoformat()}&end_date={today.isoformat()}"
+    paths = [
+        "/",
+        "/employees",
+        "/worklogs",
+        "/payroll",
+        "/payroll?view=daily",
+        "/projects",
+        "/invoices",
+        "/financials",
+        "/reports",
+        "/reports/cache",
+        "/documentation",
+    ]
+    for report_type in REPORT_TABLES:
+        paths.append(f"/reports?report_type={report_type}&{year_range}")
+    for report_type in REPORT_TABLES:
+        paths.append(f"/reports/export?report_type={report_type}&format=csv&{year_range}")
+    for entity in ENTITIES:
+        paths.append(f"/api/{entity}")
+        paths.append(f"/api/{entity}?limit={MAX_LIMIT}")
+        paths.append(f"/api/{entity}/1")
+    for granularity in ("day", "week", "month"):
+        paths.append(f"/api/charts/financials?granularity={granularity}")
+    paths.append(f"/api/charts/financials?granularity=week&{year_range}")
+    paths.append("/api/charts/projects")
+    return paths
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(iterations: int, warm_cache: bool) -> Dict[str, dict]:
+    """Time every benchmark path against the database in DATABASE_URL"""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from fastapi.testclient import TestClient
+
+    from construction_erp.app import app
+    from construction_erp.cache import report_cache
+
+    statements = [0]
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements[0] += 1
+
+    event.listen(Engine, "before_cursor_execute", count_statement)
+
+    results = {}
+    with TestClient(app) as client:
+        for path in benchmark_paths(date.today()):
+            # Warm up templates and connections
+            client.get(path)
+
+            latencies = []
+            queries = []
+            status = None
+            for _ in range(iterations):
+                if not warm_cache:
+                    report_cache.clear()
+                statements[0] = 0
+                started = time.perf_counter()
+                response = client.get(path)
+                latencies.append(time.perf_counter() - started)
+                queries.append(statements[0])
+                status = response.status_code
+
+            results[path] = {
+                "status": status,
+                "p50_ms": round(statistics.median(latencies) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+                "queries": max(queries),
+                "bytes": len(response.content),
+            }
+            print(f"{results[path]['p50_ms']:>9.2f} ms p50 {results[path]['p95_ms']:>9.2f} ms p95 "
+                  f"{results[path]['queries']:>4} queries  {path}")
+
+    event.remove(Engine, "before_cursor_execute", count_statement)
+    return results
+
+
+def compare(previous: dict, current: dict) -> None:
+    """Print the p50 change of every path present in both result files"""
+    print(f"\nCompared with {previous.get('commit', 'unknown')}:")
+    for path, result in current["routes"].items():
+        before = previous.get("routes", {}).get(path)
+        if not before or not before["p50_ms"]:
+            continue
+        change = (result["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100
+        print(f"{change:>+8.1f}%  {before['p50_ms']:>9.2f} -> {result['p50_ms']:>9.2f} ms  "
+              f"queries {before['queries']} -> {result['queries']}  {path}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", help="existing seeded database, a temporary one is seeded otherwise")
+    parser.add_argument("--scale", choices=SCALES, default="small", help="scale of the temporary database")
+    parser.add_argument("--iterations", type=int, default=10, help="timed requests per path")
+    parser.add_argument("--warm-cache", action="store_true", help="keep the report cache between requests")
+    parser.add_argument("--output", default="benchmark-results.json", help="results file to write")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.db
+        if not path:
+            path = os.path.join(directory, "benchmark.db")
+            seed(path, SCALES[args.scale])
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+
+        started = time.perf_counter()
+        routes = run(args.iterations, args.warm_cache)
+
+    results = {
+        "commit": git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "database": args.db or f"temporary ({args.scale})",
+        "iterations": args.iterations,
+        "warm_cache": args.warm_cache,
+        "seconds": round(time.perf_counter() - started, 1),
+        "routes": routes,
+    }
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as previous:
+            compare(json.load(previous), results)
+
+    failed = [path for path, result in routes.items() if result["status"] != 200]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
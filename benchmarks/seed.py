@@ -0,0 +1,224 @@
+"""
+Synthetic data generator for benchmarking
+
+Fills every table with deterministic, realistic looking data at a chosen
+scale: employees with a work log for most weekdays over several years,
+weekly payments, projects with costs and invoices, and daily accounts
+payable, paid accounts and expenses. Stored totals (work log hours and
+pay, project rollups, financial summaries) are filled in the same way the
+app maintains them.
+
+Usage:
+    python -m construction_erp.benchmarks.seed --db bench.db [--scale small|medium|large]
+        [--employees N] [--years N] [--seed N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, time as time_of_day, timedelta
+from typing import Any, Dict, Iterator, List
+
+# Rows inserted per executemany
+INSERT_BATCH_SIZE = 10000
+
+SCALES = {
+    "small": {"employees": 50, "years": 1, "projects": 20, "financials_per_day": 5},
+    "medium": {"employees": 500, "years": 2, "projects": 200, "financials_per_day": 20},
+    "large": {"employees": 5000, "years": 3, "projects": 2000, "financials_per_day": 100},
+}
+
+SUPPLIERS = ["Acme Lumber", "Steel Supply Co", "City Concrete", "Hardware Depot", "Electric Wholesale"]
+CATEGORIES = ["Materials", "Equipment", "Rent", "Utilities", "Fuel", "Insurance"]
+METHODS = ["cash", "check"]
+BANKS = ["First National", "Community Bank", "Credit Union"]
+
+
+def _weekdays(start: date, end: date) -> Iterator[date]:
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            yield day
+        day += timedelta(days=1)
+
+
+def generate(scale: Dict[str, int], end: date, rng: random.Random) -> Iterator[tuple]:
+    """Yield (table name, row dict) pairs in foreign key order"""
+    from construction_erp.models import WorkLog
+
+    start = end - timedelta(days=365 * scale["years"])
+
+    rates = {}
+    for employee_id in range(1, scale["employees"] + 1):
+        rates[employee_id] = float(rng.randint(15, 45))
+        yield "employees", {"id": employee_id, "name": f"Employee {employee_id}", "hourly_rate": rates[employee_id]}
+
+    for day in _weekdays(start, end):
+        for employee_id, rate in rates.items():
+            if rng.random() < 0.1:
+                continue  # day off
+            entry_time = time_of_day(rng.randint(6, 9), rng.choice((0, 15, 30, 45)))
+            exit_time = time_of_day(rng.randint(15, 18), rng.choice((0, 15, 30, 45)))
+            lunch_duration = rng.choice((0, 30, 45, 60))
+            hours_worked = WorkLog.calculate_hours(entry_time, exit_time, lunch_duration)
+            yield "worklogs", {
+                "employee_id": employee_id,
+                "date": day,
+                "entry_time": entry_time,
+                "exit_time": exit_time,
+                "lunch_duration": lunch_duration,
+                "hours_worked": hours_worked,
+                "gross_pay": hours_worked * rate,
+            }
+
+        # Weekly payroll every Friday
+        if day.weekday() == 4:
+            for employee_id, rate in rates.items():
+                yield "payments", {
+                    "employee_id": employee_id,
+                    "amount": round(rate * rng.uniform(30, 45), 2),
+                    "payment_method": rng.choice(METHODS),
+                    "payment_date": day,
+                    "notes": None,
+                }
+
+    total_days = (end - start).days
+    for project_id in range(1, scale["projects"] + 1):
+        project_start = start + timedelta(days=rng.randint(0, max(total_days - 90, 0)))
+        value = float(rng.randint(20, 500) * 1000)
+        yield "projects", {
+            "id": project_id,
+            "name": f"Project {project_id}",
+            "value": value,
+            "start_date": project_start,
+            "end_date": project_start + timedelta(days=rng.randint(60, 365)),
+            "total_costs": 0.0,
+            "total_invoiced": 0.0,
+        }
+        for number in range(rng.randint(5, 30)):
+            yield "project_costs", {
+                "project_id": project_id,
+                "cost_type": rng.choice(("material", "employee")),
+                "description": f"Cost {number + 1}",
+                "amount": round(value * rng.uniform(0.005, 0.04), 2),
+            }
+        for number in range(rng.randint(1, 8)):
+            yield "invoices", {
+                "project_id": project_id,
+                "amount_charged": round(value * rng.uniform(0.05, 0.25), 2),
+                "invoice_date": min(project_start + timedelta(days=30 * (number + 1)), end),
+            }
+
+    for offset in range(total_days + 1):
+        day = start + timedelta(days=offset)
+        for _ in range(scale["financials_per_day"]):
+            method = rng.choice(METHODS)
+            supplier = rng.choice(SUPPLIERS)
+            category = rng.choice(CATEGORIES)
+            amount = round(rng.uniform(50, 5000), 2)
+            yield "accounts_payable", {
+                "supplier": supplier,
+                "description": f"{category} invoice",
+                "amount": amount,
+                "due_date": day + timedelta(days=rng.randint(0, 60)),
+                "payment_method": method,
+                "category": category,
+                "status": "pending" if rng.random() < 0.3 else "paid",
+                "notes": None,
+            }
+            yield "paid_accounts", {
+                "supplier": supplier,
+                "amount_paid": amount,
+                "payment_date": day,
+                "payment_method": method,
+                "check_number": str(rng.randint(1000, 9999)) if method == "check" else None,
+                "check_bank": rng.choice(BANKS) if method == "check" else None,
+                "payment_proof": None,
+                "notes": None,
+            }
+            yield "expenses", {
+                "description": f"{category} purchase",
+                "amount": round(rng.uniform(10, 2000), 2),
+                "expense_date": day,
+                "category": category,
+                "payment_method": method,
+                "notes": None,
+            }
+
+
+def seed(path: str, scale: Dict[str, int], seed_value: int = 0, end: date = None) -> Dict[str, int]:
+    """
+    Create a database at path and fill it with synthetic data
+
+    Args:
+        path: SQLite file to create, must not exist yet
+        scale: Row volumes, see SCALES
+        seed_value: Random seed, the same seed produces the same data
+        end: Last day of generated activity, defaults to today
+
+    Returns:
+        Number of rows inserted per table
+    """
+    if os.path.exists(path):
+        raise FileExistsError(f"{path} already exists")
+
+    # Settings are read from the environment when the package is imported
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    from construction_erp import models, rollups, summary
+    from construction_erp.database import engine
+    from construction_erp.migrations import upgrade
+
+    upgrade(engine)
+    tables = models.Base.metadata.tables
+    rng = random.Random(seed_value)
+    counts: Dict[str, int] = {}
+    pending: Dict[str, List[Dict[str, Any]]] = {}
+
+    def flush(conn):
+        # Tables are flushed in the order generate() first yields them,
+        # so parent rows are always inserted before their children
+        for table, rows in pending.items():
+            if rows:
+                conn.execute(tables[table].insert(), rows)
+                counts[table] = counts.get(table, 0) + len(rows)
+                rows.clear()
+
+    with engine.begin() as conn:
+        for table, row in generate(scale, end or date.today(), rng):
+            rows = pending.setdefault(table, [])
+            rows.append(row)
+            if len(rows) == INSERT_BATCH_SIZE:
+                flush(conn)
+        flush(conn)
+
+    rollups.reconcile(engine)
+    summary.rebuild(engine)
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", required=True, help="SQLite file to create")
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--employees", type=int, help="override the scale's employee count")
+    parser.add_argument("--years", type=int, help="override the scale's years of history")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    scale = dict(SCALES[args.scale])
+    if args.employees:
+        scale["employees"] = args.employees
+    if args.years:
+        scale["years"] = args.years
+
+    started = time.perf_counter()
+    counts = seed(args.db, scale, args.seed)
+    for table, count in counts.items():
+        print(f"{table:>18}: {count}")
+    print(f"Seeded {args.db} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+In-process LRU cache for report data
+
+Entries remember the change counters (see versions.py) of the tables they
+were built from. A lookup whose counters no longer match is treated as a
+miss and the stale entry is dropped, so any write in any worker process
+invalidates the affected reports.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from construction_erp.config import REPORT_CACHE_MAX_ENTRIES, REPORT_CACHE_MAX_BYTES
+from construction_erp.metrics import CACHE_LOOKUPS
+
+
+def estimate_size(value: Any) -> int:
+    """Roughly estimate the memory held by a value and everything it references"""
+    seen = set()
+    stack = [value]
+    total = 0
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            # ORM objects: count loaded attributes, not SQLAlchemy internals
+            stack.extend(
+                attr for name, attr in vars(obj).items() if name != "_sa_instance_state"
+            )
+
+    return total
+
+
+class VersionedLRUCache:
+    """LRU cache bounded by entry count and estimated memory"""
+
+    def __init__(self, name: str, max_entries: int = REPORT_CACHE_MAX_ENTRIES, max_bytes: int = REPORT_CACHE_MAX_BYTES):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (versions, value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._hit_counter = CACHE_LOOKUPS.labels(name, "hit")
+        self._miss_counter = CACHE_LOOKUPS.labels(name, "miss")
+
+    def get(self, key: Hashable, versions: Dict[str, int]) -> Optional[Any]:
+        """Get a cached value if it was built from the given table versions"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                self._miss_counter.inc()
+                return None
+
+            if entry[0] != versions:
+                self._remove(key)
+                self.invalidations += 1
+                self.misses += 1
+                self._miss_counter.inc()
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._hit_counter.inc()
+            return entry[1]
+
+    def set(self, key: Hashable, versions: Dict[str, int], value: Any) -> None:
+        """Store a value built from the given table versions"""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (dict(versions), value, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get counters for sizing the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+
+# Shared by all requests handled by this worker process
+report_cache = VersionedLRUCache("report")
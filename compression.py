@@ -0,0 +1,233 @@
+"""
+gzip / brotli response compression
+
+Responses are compressed when the client accepts it, the content type is
+text-like (COMPRESSIBLE_TYPES) and the body is at least
+COMPRESSION_MIN_SIZE bytes. Brotli is preferred when the optional
+`brotli` package is installed. Responses that already have a
+Content-Encoding, and types that are compressed by nature (images, fonts,
+archives), pass through untouched.
+
+Streaming responses (report exports) are compressed chunk by chunk and
+flushed after every chunk, so rows still reach the client as they are
+produced.
+
+Strong ETags get the encoding appended ("abc" -> "abc-gzip"), as the
+compressed body is a different representation; the suffix is removed from
+If-None-Match before the request reaches the routes.
+"""
+import gzip
+import zlib
+from typing import List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+from construction_erp.config import COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY, COMPRESSION_MIN_SIZE
+
+COMPRESSIBLE_TYPES = {
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/csv",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "application/x-ndjson",
+    "image/svg+xml",
+}
+
+
+def supported_encodings() -> List[str]:
+    """Encodings this server can produce, most preferred first"""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred supported encoding the client accepts, None for identity"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    for encoding in supported_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a whole body"""
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits 16+ writes a gzip header and trailer
+            self._compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def _split_etag(value: str) -> Tuple[str, Optional[str]]:
+    """Remove an encoding suffix from a strong ETag"""
+    for encoding in ("gzip", "br"):
+        suffix = f'-{encoding}"'
+        if value.endswith(suffix) and not value.startswith("W/"):
+            return value[: -len(suffix)] + '"', encoding
+    return value, None
+
+
+def _encode_etag(value: str, encoding: str) -> str:
+    if value.startswith("W/") or not value.endswith('"'):
+        return value
+    return f'{value[:-1]}-{encoding}"'
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing eligible responses with gzip or brotli"""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+
+        # Let routes compare If-None-Match against their own (identity) ETags.
+        # The header is replaced in the shared scope rather than in a copy,
+        # so what the router adds (scope["route"]) stays visible to outer
+        # middleware such as MetricsMiddleware.
+        client_encoding = None
+        if b"if-none-match" in headers:
+            tags = []
+            for tag in headers[b"if-none-match"].decode("latin-1").split(","):
+                tag, tag_encoding = _split_etag(tag.strip())
+                client_encoding = client_encoding or tag_encoding
+                tags.append(tag)
+            scope["headers"] = [
+                (name, ", ".join(tags).encode("latin-1") if name == b"if-none-match" else value)
+                for name, value in scope["headers"]
+            ]
+
+        if encoding is None and client_encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(send, encoding, client_encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, send, encoding: Optional[str], client_encoding: Optional[str], minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.client_encoding = client_encoding
+        self.minimum_size = minimum_size
+        self.start = None
+        self.compressor = None
+        self.passthrough = False
+
+    def _eligible(self) -> bool:
+        if self.encoding is None or self.start["status"] in (204, 304):
+            return False
+        headers = {name.lower(): value for name, value in self.start["headers"]}
+        if b"content-encoding" in headers:
+            return False
+        content_type = headers.get(b"content-type", b"").decode("latin-1").split(";")[0].strip().lower()
+        return content_type in COMPRESSIBLE_TYPES
+
+    def _headers(self, content_length: Optional[int]) -> list:
+        headers = []
+        for name, value in self.start["headers"]:
+            lower = name.lower()
+            if lower == b"content-length":
+                continue
+            if lower == b"etag":
+                value = _encode_etag(value.decode("latin-1"), self.encoding).encode("latin-1")
+            if lower == b"vary":
+                continue
+            headers.append((name, value))
+        vary = [value for name, value in self.start["headers"] if name.lower() == b"vary"]
+        headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode("latin-1")))
+        return headers
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            if self.start["status"] == 304 and self.client_encoding:
+                # Confirm the client's copy with the ETag it holds
+                message = dict(message, headers=[
+                    (name, _encode_etag(value.decode("latin-1"), self.client_encoding).encode("latin-1")
+                     if name.lower() == b"etag" else value)
+                    for name, value in message["headers"]
+                ])
+                self.passthrough = True
+                await self._send(message)
+            elif not self._eligible():
+                self.passthrough = True
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None and not more_body:
+            # Whole body in one message
+            if len(body) < self.minimum_size:
+                self.passthrough = True
+                await self._send(self.start)
+                await self._send(message)
+                return
+            compressed = compress(body, self.encoding)
+            await self._send(dict(self.start, headers=self._headers(len(compressed))))
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+
+        if self.compressor is None:
+            # Streaming body: length unknown, compress as it goes
+            self.compressor = _StreamCompressor(self.encoding)
+            await self._send(dict(self.start, headers=self._headers(None)))
+
+        data = self.compressor.chunk(body) if body else b""
+        if not more_body:
+            data += self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
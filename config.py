@@ -0,0 +1,72 @@
+"""
+Deployment settings read from environment variables
+
+Every setting has a default suitable for a single-server install, so the
+application runs without any environment configured.
+"""
+import os
+
+
+def _int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def _float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+# Database
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./construction_erp.db")
+
+# SQLite connection tuning, applied to every new connection (see database.py)
+SQLITE_JOURNAL_MODE = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = _int("SQLITE_BUSY_TIMEOUT_MS", 5000)
+SQLITE_MMAP_SIZE = _int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)
+SQLITE_CACHE_SIZE_KB = _int("SQLITE_CACHE_SIZE_KB", 64 * 1024)
+SQLITE_TEMP_STORE = os.environ.get("SQLITE_TEMP_STORE", "MEMORY")
+
+# Upgrade an outdated database schema on startup; when off the app refuses
+# to start until `python -m construction_erp.migrations upgrade` has been run.
+# Under gunicorn the upgrade runs once in the master before workers start
+# (see gunicorn.conf.py), so workers never race to upgrade.
+SCHEMA_AUTO_UPGRADE = os.environ.get("SCHEMA_AUTO_UPGRADE", "1") not in ("0", "false", "no")
+
+# Use a separate read-only engine for pages that only read, so report
+# queries never wait for a connection behind work log writes
+DB_SEPARATE_READ_ENGINE = os.environ.get("DB_SEPARATE_READ_ENGINE", "1") not in ("0", "false", "no")
+
+# Raise instead of lazy loading relationships that a query did not load
+# up front; meant for development and tests to catch N+1 query patterns
+DB_STRICT_LOADING = os.environ.get("DB_STRICT_LOADING", "0") in ("1", "true", "yes")
+
+# How route handlers run their (blocking) database work:
+#   "threadpool" - in a bounded worker thread pool, keeping the event loop free
+#   "inline"     - directly on the event loop (previous behaviour)
+DB_EXECUTION_MODE = os.environ.get("DB_EXECUTION_MODE", "threadpool")
+DB_THREAD_POOL_SIZE = _int("DB_THREAD_POOL_SIZE", 16)
+
+# Report cache (see cache.py)
+REPORT_CACHE_MAX_ENTRIES = _int("REPORT_CACHE_MAX_ENTRIES", 256)
+REPORT_CACHE_MAX_BYTES = _int("REPORT_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+
+# Fraction of requests timed by the instrumentation middleware (see
+# instrumentation.py); 1 times every request, 0 turns it off
+INSTRUMENTATION_SAMPLE_RATE = _float("INSTRUMENTATION_SAMPLE_RATE", 0.01)
+
+# Templates (see templating.py): directory of the Jinja bytecode cache
+# (default: a per-user temporary directory) and an optional precompiled
+# template artifact built with `python -m construction_erp.templating build`
+TEMPLATE_CACHE_DIR = os.environ.get("TEMPLATE_CACHE_DIR") or None
+TEMPLATE_ARTIFACT = os.environ.get("TEMPLATE_ARTIFACT") or None
+
+# Response compression (see compression.py): smallest body worth
+# compressing in bytes, gzip level (1-9) and brotli quality (0-11)
+COMPRESSION_MIN_SIZE = _int("COMPRESSION_MIN_SIZE", 1024)
+COMPRESSION_GZIP_LEVEL = _int("COMPRESSION_GZIP_LEVEL", 6)
+COMPRESSION_BROTLI_QUALITY = _int("COMPRESSION_BROTLI_QUALITY", 4)
+
+# Fingerprinted static assets (see assets.py), served under /assets
+STATIC_BUILD_DIR = os.environ.get(
+    "STATIC_BUILD_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "build", "static")
+)
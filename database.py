@@ -1,16 +1,72 @@
-from sqlalchemy import create_engine
+import functools
+
+import anyio
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, raiseload, sessionmaker
+
+from construction_erp import config
+from construction_erp.config import DATABASE_URL, DB_EXECUTION_MODE, DB_THREAD_POOL_SIZE
+
+SQLALCHEMY_DATABASE_URL = DATABASE_URL
+
+def _is_sqlite_file(url):
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+def _sqlite_pragmas(read_only=False):
+    """PRAGMA statements run on every new SQLite connection"""
+    pragmas = [
+        f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={config.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA mmap_size={config.SQLITE_MMAP_SIZE}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size=-{config.SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA temp_store={config.SQLITE_TEMP_STORE}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./construction_erp.db"
+def create_db_engine(url=SQLALCHEMY_DATABASE_URL, read_only=False):
+    """Create an engine, tuning SQLite connections as they are opened"""
+    new_engine = create_engine(url, connect_args={"check_same_thread": False})
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+    if new_engine.dialect.name == "sqlite":
+        pragmas = _sqlite_pragmas(read_only)
+
+        @event.listens_for(new_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+    return new_engine
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only engine for pages that only read; an in-memory database cannot
+# be shared between engines, so it keeps using the write engine
+if config.DB_SEPARATE_READ_ENGINE and _is_sqlite_file(SQLALCHEMY_DATABASE_URL):
+    read_engine = create_db_engine(read_only=True)
+else:
+    read_engine = engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 Base = declarative_base()
 
+@event.listens_for(Session, "do_orm_execute")
+def _raise_on_lazy_load(orm_execute_state):
+    """In strict loading mode, make unplanned relationship loads raise"""
+    if (config.DB_STRICT_LOADING
+            and orm_execute_state.is_select
+            and not orm_execute_state.is_relationship_load):
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
 # Dependency to get the database session
 def get_db():
     db = SessionLocal()
@@ -18,3 +74,38 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get a read-only database session
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Limits how many requests run database work at the same time
+_db_limiter = None
+
+def _get_db_limiter():
+    # Created lazily, a capacity limiter must belong to the running event loop
+    global _db_limiter
+    if _db_limiter is None:
+        _db_limiter = anyio.CapacityLimiter(DB_THREAD_POOL_SIZE)
+    return _db_limiter
+
+def db_route(func):
+    """
+    Run a blocking route handler without blocking the event loop
+
+    In "threadpool" mode the handler runs in a worker thread from a pool
+    bounded by DB_THREAD_POOL_SIZE; in "inline" mode it runs on the event
+    loop as before.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if DB_EXECUTION_MODE == "inline":
+            return func(*args, **kwargs)
+        return await anyio.to_thread.run_sync(
+            functools.partial(func, *args, **kwargs), limiter=_get_db_limiter()
+        )
+    return wrapper
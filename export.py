@@ -0,0 +1,262 @@
+"""
+Streaming CSV and NDJSON export for every report type
+
+Reports that list rows (payments, payables, paid accounts, expenses) are
+read with yield_per so only one batch of rows is in memory at a time.
+Summary reports have one row per employee, project or payment method and
+are exported from the regular report data.
+"""
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterable, Iterator, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from construction_erp import models
+from construction_erp.reports import build_report
+
+# Rows fetched from the database per batch
+EXPORT_BATCH_SIZE = 1000
+
+# Report type -> [(ndjson key, csv header)], matching the columns of reports.html
+EXPORT_COLUMNS = {
+    "payroll": [
+        ("employee", "Employee"),
+        ("amount", "Amount"),
+        ("payment_method", "Payment Method"),
+        ("payment_date", "Payment Date"),
+        ("notes", "Notes"),
+    ],
+    "payment_method": [
+        ("payment_method", "Payment Method"),
+        ("total_amount", "Total Amount"),
+    ],
+    "hours_worked": [
+        ("employee", "Employee"),
+        ("hourly_rate", "Hourly Rate"),
+        ("total_hours", "Total Hours"),
+        ("total_value", "Total Value"),
+    ],
+    "project_billing": [
+        ("project", "Project"),
+        ("total_invoiced", "Total Invoiced"),
+        ("total_costs", "Total Costs"),
+        ("profit", "Profit"),
+        ("profit_percentage", "Profit %"),
+    ],
+    "project_cost": [
+        ("project", "Project"),
+        ("material_costs", "Material Costs"),
+        ("employee_costs", "Employee Costs"),
+        ("total_costs", "Total Costs"),
+    ],
+    "project_profit": [
+        ("project", "Project"),
+        ("total_invoiced", "Total Invoiced"),
+        ("total_costs", "Total Costs"),
+        ("profit_margin", "Profit Margin"),
+        ("profit_percentage", "Profit %"),
+    ],
+    "accounts_payable": [
+        ("supplier", "Supplier"),
+        ("description", "Description"),
+        ("amount", "Amount"),
+        ("due_date", "Due Date"),
+        ("payment_method", "Payment Method"),
+        ("category", "Category"),
+    ],
+    "paid_accounts": [
+        ("supplier", "Supplier"),
+        ("amount_paid", "Amount Paid"),
+        ("payment_date", "Payment Date"),
+        ("payment_method", "Payment Method"),
+        ("check_details", "Check Details"),
+    ],
+    "monthly_expense": [
+        ("description", "Description"),
+        ("amount", "Amount"),
+        ("date", "Date"),
+        ("category", "Category"),
+        ("payment_method", "Payment Method"),
+    ],
+    "paid_by_method": [
+        ("payment_method", "Payment Method"),
+        ("total_amount", "Total Amount"),
+    ],
+    "payment_forecast": [
+        ("supplier", "Supplier"),
+        ("amount", "Amount"),
+        ("due_date", "Due Date"),
+    ],
+}
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _stream(db: Session, statement) -> Iterator[tuple]:
+    """Execute a Core select and yield its rows in batches"""
+    result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for row in result:
+        yield tuple(row)
+
+
+def _check_details(payment_method, check_number, check_bank) -> str:
+    """Format check details the way the paid accounts report shows them"""
+    if payment_method != "check":
+        return "N/A"
+    if not check_number:
+        return ""
+    return f"#{check_number} ({check_bank})" if check_bank else f"#{check_number}"
+
+
+def _percentage(profit: float, total_invoiced: float):
+    return round(profit / total_invoiced * 100, 2) if total_invoiced > 0 else None
+
+
+def iter_report_rows(db: Session, report_type: str, start_date: date, end_date: date) -> Iterator[tuple]:
+    """Yield the rows of a report in EXPORT_COLUMNS order"""
+    if report_type == "payroll":
+        yield from _stream(db, select(
+            models.Employee.name,
+            models.Payment.amount,
+            models.Payment.payment_method,
+            models.Payment.payment_date,
+            models.Payment.notes,
+        ).outerjoin(
+            models.Employee, models.Employee.id == models.Payment.employee_id
+        ).where(
+            models.Payment.payment_date >= start_date,
+            models.Payment.payment_date <= end_date
+        ).order_by(models.Payment.payment_date, models.Payment.id))
+
+    elif report_type == "accounts_payable":
+        yield from _stream(db, select(
+            models.AccountsPayable.supplier,
+            models.AccountsPayable.description,
+            models.AccountsPayable.amount,
+            models.AccountsPayable.due_date,
+            models.AccountsPayable.payment_method,
+            models.AccountsPayable.category,
+        ).where(
+            models.AccountsPayable.due_date >= start_date,
+            models.AccountsPayable.due_date <= end_date,
+            models.AccountsPayable.status == "pending"
+        ).order_by(models.AccountsPayable.due_date, models.AccountsPayable.id))
+
+    elif report_type == "paid_accounts":
+        rows = _stream(db, select(
+            models.PaidAccount.supplier,
+            models.PaidAccount.amount_paid,
+            models.PaidAccount.payment_date,
+            models.PaidAccount.payment_method,
+            models.PaidAccount.check_number,
+            models.PaidAccount.check_bank,
+        ).where(
+            models.PaidAccount.payment_date >= start_date,
+            models.PaidAccount.payment_date <= end_date
+        ).order_by(models.PaidAccount.payment_date, models.PaidAccount.id))
+        for supplier, amount_paid, payment_date, method, check_number, check_bank in rows:
+            yield (supplier, amount_paid, payment_date, method,
+                   _check_details(method, check_number, check_bank))
+
+    elif report_type == "monthly_expense":
+        yield from _stream(db, select(
+            models.Expense.description,
+            models.Expense.amount,
+            models.Expense.expense_date,
+            models.Expense.category,
+            models.Expense.payment_method,
+        ).where(
+            models.Expense.expense_date >= start_date,
+            models.Expense.expense_date <= end_date
+        ).order_by(models.Expense.expense_date, models.Expense.id))
+
+    elif report_type == "payment_forecast":
+        yield from _stream(db, select(
+            models.AccountsPayable.supplier,
+            models.AccountsPayable.amount,
+            models.AccountsPayable.due_date,
+        ).where(
+            models.AccountsPayable.status == "pending"
+        ).order_by(models.AccountsPayable.due_date, models.AccountsPayable.id))
+
+    elif report_type in EXPORT_COLUMNS:
+        # Summary reports: one row per employee, project or payment method
+        report_data = build_report(db, report_type, start_date, end_date)
+
+        if report_type == "payment_method":
+            yield ("cash", report_data["cash_total"])
+            yield ("check", report_data["check_total"])
+        elif report_type == "hours_worked":
+            for item in report_data["hours_data"]:
+                employee = item["employee"]
+                yield (employee.name, employee.hourly_rate, item["total_hours"], item["amount_due"])
+        elif report_type == "project_billing":
+            for item in report_data["billing_data"]:
+                yield (item["project"].name, item["total_invoiced"], item["total_costs"], item["profit"],
+                       _percentage(item["profit"], item["total_invoiced"]))
+        elif report_type == "project_cost":
+            for item in report_data["cost_data"]:
+                yield (item["project"].name, item["material_costs"], item["employee_costs"], item["total_costs"])
+        elif report_type == "project_profit":
+            for item in report_data["profit_data"]:
+                yield (item["project"].name, item["total_invoiced"], item["total_costs"], item["profit_margin"],
+                       _percentage(item["profit_margin"], item["total_invoiced"]))
+        elif report_type == "paid_by_method":
+            for method, amount in report_data["methods"].items():
+                yield (method, amount)
+
+
+def _format_value(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float):
+        return round(value, 2)
+    return value
+
+
+def stream_csv(columns: List[Tuple[str, str]], rows: Iterable[tuple]) -> Iterator[str]:
+    """Encode rows as CSV, yielding one chunk per batch of rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for _, header in columns])
+
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(["" if value is None else _format_value(value) for value in row])
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def stream_ndjson(columns: List[Tuple[str, str]], rows: Iterable[tuple]) -> Iterator[str]:
+    """Encode rows as newline-delimited JSON objects, one chunk per batch of rows"""
+    keys = [key for key, _ in columns]
+    lines = []
+
+    for row in rows:
+        lines.append(json.dumps(dict(zip(keys, (_format_value(value) for value in row)))))
+        if len(lines) == EXPORT_BATCH_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def export_report(db: Session, report_type: str, export_format: str, start_date: date, end_date: date) -> Iterator[str]:
+    """Stream a report in the given format ("csv" or "ndjson")"""
+    columns = EXPORT_COLUMNS[report_type]
+    rows = iter_report_rows(db, report_type, start_date, end_date)
+
+    if export_format == "csv":
+        return stream_csv(columns, rows)
+    return stream_ndjson(columns, rows)
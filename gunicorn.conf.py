@@ -0,0 +1,35 @@
+"""
+gunicorn settings, loaded automatically when gunicorn starts in this directory
+
+Sets up a shared directory for Prometheus metrics so /metrics reports
+totals across all workers (see metrics.py), and upgrades the database
+schema once in the master process so workers never race to upgrade it.
+"""
+import os
+import shutil
+import tempfile
+
+worker_class = "uvicorn.workers.UvicornWorker"
+
+
+def on_starting(server):
+    # Workers inherit the environment, so they all write to the same directory
+    directory = os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "construction_erp_metrics")
+    )
+    # Counters of a previous run would otherwise be added to this one
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+    # Upgrade before any worker is forked, so each worker only reads the stored version
+    from construction_erp.config import SCHEMA_AUTO_UPGRADE
+    from construction_erp.database import engine
+    from construction_erp.migrations import check_schema
+    check_schema(engine, auto_upgrade=SCHEMA_AUTO_UPGRADE)
+    # Workers must not share the master's SQLite connections
+    engine.dispose()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,84 @@
+"""
+Conditional GET helpers (ETag, Last-Modified, 304 Not Modified)
+
+ETags are built from the change counters of the tables a response reads
+(see versions.snapshot) and the request path and parameters. The check
+runs before any rows are queried, so an unchanged page costs one small
+query. Page ETags also include a hash of the template sources and asset
+manifest, so a deploy with changed templates or assets invalidates cached
+pages.
+"""
+import hashlib
+import json
+from datetime import date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from construction_erp.assets import manifest_version
+from construction_erp.templating import source_checksums
+
+# Changes whenever a template or a fingerprinted asset (linked from every page) changes
+RENDER_VERSION = hashlib.sha256(
+    json.dumps([source_checksums(), manifest_version()], sort_keys=True).encode()
+).hexdigest()[:16]
+
+
+def etag(request: Request, *parts: Any) -> str:
+    """Strong ETag of a response built from the given data versions and the request"""
+    params = sorted(request.query_params.multi_items())
+    key = json.dumps([request.url.path, params, *parts], sort_keys=True, default=str)
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+
+def headers(tag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """Validator headers; clients may store the response but must revalidate it"""
+    result = {"ETag": tag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        result["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return result
+
+
+def is_not_modified(request: Request, tag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Whether the client's cached copy is current (If-None-Match wins over If-Modified-Since)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [value.strip() for value in if_none_match.split(",")]
+        return "*" in tags or tag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since is None:
+            return False
+        # HTTP dates have whole seconds
+        return _as_utc(last_modified).replace(microsecond=0) <= since
+
+    return False
+
+
+def not_before_today(last_modified: Optional[datetime]) -> datetime:
+    """
+    Last-Modified of a response that also depends on the current date
+
+    Responses with date-dependent content (the dashboard, default date
+    ranges) change at midnight even when no data changed, so they are never
+    older than the start of today. Returned as naive UTC like the stored
+    timestamps.
+    """
+    midnight = datetime.combine(date.today(), datetime.min.time()).astimezone(timezone.utc).replace(tzinfo=None)
+    return max(last_modified, midnight) if last_modified is not None else midnight
+
+
+def not_modified(tag: str, last_modified: Optional[datetime] = None) -> Response:
+    return Response(status_code=304, headers=headers(tag, last_modified))
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Stored timestamps are naive UTC (SQLite CURRENT_TIMESTAMP)
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
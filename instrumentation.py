@@ -0,0 +1,150 @@
+"""
+Per-request SQL and template timing
+
+For a sample of requests (INSTRUMENTATION_SAMPLE_RATE) the middleware
+records how many SQL statements ran, the total and slowest statement time,
+the time spent rendering Jinja templates and the total handler time. The
+numbers are returned in a Server-Timing header, which browser developer
+tools display per request, and written as one JSON log line.
+
+Statements are timed with SQLAlchemy engine events and attributed to the
+request through a context variable, which is inherited by the worker
+threads that run route handlers (see database.db_route). SQL time covers
+statement execution; fetching rows and building ORM objects is the part
+of handler time not covered by sql and render.
+"""
+import contextvars
+import json
+import logging
+import random
+import time
+from typing import Optional
+
+from jinja2 import Template
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from construction_erp.assets import ASSETS_URL
+from construction_erp.config import INSTRUMENTATION_SAMPLE_RATE
+
+logger = logging.getLogger("construction_erp.requests")
+
+# Longest statement text kept for the log line
+MAX_STATEMENT_LENGTH = 300
+
+
+class RequestMetrics:
+    """Timings collected while handling one request"""
+
+    __slots__ = ("statements", "sql_seconds", "slowest_seconds", "slowest_statement", "render_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.sql_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = None
+        self.render_seconds = 0.0
+
+
+_current: contextvars.ContextVar[Optional[RequestMetrics]] = contextvars.ContextVar(
+    "request_metrics", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current.get()
+    if metrics is None or not conn.info.get("statement_started"):
+        return
+
+    elapsed = time.perf_counter() - conn.info["statement_started"].pop()
+    metrics.statements += 1
+    metrics.sql_seconds += elapsed
+    if elapsed > metrics.slowest_seconds:
+        metrics.slowest_seconds = elapsed
+        metrics.slowest_statement = statement
+
+
+class TimedTemplate(Template):
+    """Jinja template that adds its render time to the current request"""
+
+    def render(self, *args, **kwargs):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(*args, **kwargs)
+
+        started = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            metrics.render_seconds += time.perf_counter() - started
+
+
+def server_timing(metrics: RequestMetrics, handler_seconds: float) -> str:
+    """Format metrics as a Server-Timing header value"""
+    return ", ".join([
+        f'sql;dur={metrics.sql_seconds * 1000:.2f};desc="{metrics.statements} statements"',
+        f"sql-slowest;dur={metrics.slowest_seconds * 1000:.2f}",
+        f"render;dur={metrics.render_seconds * 1000:.2f}",
+        f"handler;dur={handler_seconds * 1000:.2f}",
+    ])
+
+
+class InstrumentationMiddleware:
+    """ASGI middleware that instruments a sample of HTTP requests"""
+
+    def __init__(self, app, sample_rate: float = INSTRUMENTATION_SAMPLE_RATE, skip_prefixes=("/static", ASSETS_URL)):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.skip_prefixes = tuple(skip_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"].startswith(self.skip_prefixes)
+            or random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        status = None
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                # Streaming responses keep running after the headers are sent,
+                # so the header covers the work done up to this point
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    server_timing(metrics, time.perf_counter() - started).encode("latin-1"),
+                ))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            slowest = metrics.slowest_statement
+            logger.info(json.dumps({
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "handler_ms": round((time.perf_counter() - started) * 1000, 2),
+                "sql_ms": round(metrics.sql_seconds * 1000, 2),
+                "statements": metrics.statements,
+                "slowest_sql_ms": round(metrics.slowest_seconds * 1000, 2),
+                "slowest_sql": " ".join(slowest.split())[:MAX_STATEMENT_LENGTH] if slowest else None,
+                "render_ms": round(metrics.render_seconds * 1000, 2),
+            }))
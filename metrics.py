@@ -0,0 +1,144 @@
+"""
+Prometheus metrics served at /metrics
+
+Request counts and latency are labelled with the route template (for
+example /reports, split by report type as /reports?report_type=payroll)
+rather than the raw path, so the number of series stays bounded.
+
+Under gunicorn every worker keeps its own counters. When the
+PROMETHEUS_MULTIPROC_DIR environment variable is set (gunicorn.conf.py
+sets it up), workers write their values to files in that directory and
+/metrics adds them up across all workers, whichever worker serves it.
+"""
+import os
+import time
+from typing import Dict
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy.engine import Engine
+
+from construction_erp.reports import REPORT_TABLES
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled", ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time to handle an HTTP request", ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled", ["method"],
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to get a connection from the pool, including waiting for a free one (count = checkouts)",
+    ["engine"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+STARTUP_SECONDS = Gauge(
+    "app_startup_seconds", "Time spent starting this worker, by phase", ["phase"],
+    multiprocess_mode="liveall",
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Cache lookups by result (hit or miss)", ["cache", "result"]
+)
+
+
+def route_label(scope) -> str:
+    """Route template of a handled request, used as the route label"""
+    route = scope.get("route")
+    if route is None:
+        # Mounted apps (/static) set the mount path as root_path
+        if scope.get("endpoint") is not None and scope.get("root_path"):
+            return scope["root_path"]
+        return "unmatched"
+
+    if route.path == "/reports":
+        for key, value in _query_params(scope):
+            if key == "report_type" and value in REPORT_TABLES:
+                return f"/reports?report_type={value}"
+    return route.path
+
+
+def _query_params(scope):
+    query = scope.get("query_string", b"").decode("latin-1")
+    for pair in query.split("&"):
+        key, _, value = pair.partition("=")
+        yield key, value
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latency and in-flight requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            # The router adds the matched route to the scope
+            route = route_label(scope)
+            REQUEST_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            REQUESTS.labels(method, route, str(status)).inc()
+
+
+def record_startup(phases: Dict[str, float]) -> None:
+    """Record how long each phase of worker startup took"""
+    for phase, seconds in phases.items():
+        STARTUP_SECONDS.labels(phase).set(seconds)
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Time connection checkouts from an engine's pool"""
+    pool = engine.pool
+    connect = pool.connect
+    checkout_time = POOL_CHECKOUT.labels(name)
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            checkout_time.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+
+
+def render() -> tuple:
+    """Metrics in Prometheus text format and their content type"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,276 @@
+"""
+Lightweight schema maintenance for existing construction_erp.db files
+
+`Base.metadata.create_all` only creates missing tables; it never alters
+tables that already exist. The helpers here bring older databases up to
+date in place and recompute derived data.
+
+The database stores the SCHEMA_VERSION it was last upgraded to, so
+starting the app only needs to read one row to know whether an upgrade
+is due (see check_schema).
+
+Usage:
+    python -m construction_erp.migrations upgrade
+    python -m construction_erp.migrations status
+    python -m construction_erp.migrations backfill-worklogs
+    python -m construction_erp.migrations rebuild-summaries
+    python -m construction_erp.migrations reconcile-projects [--check]
+"""
+import logging
+import sys
+import time
+
+from sqlalchemy import inspect, select, text, func
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from construction_erp import models, summary, rollups, versions
+from construction_erp.config import SCHEMA_AUTO_UPGRADE
+from construction_erp.database import engine as default_engine
+from construction_erp.payroll import hours_worked_expression
+
+# Increase whenever a table, column or index is added to the models
+# (and ADDED_COLUMNS where needed), so existing databases get upgraded
+SCHEMA_VERSION = 2
+
+# Columns added after the initial schema: table -> [(column, SQL type)]
+ADDED_COLUMNS = {
+    "worklogs": [
+        ("hours_worked", "FLOAT"),
+        ("gross_pay", "FLOAT"),
+    ],
+    "projects": [
+        ("total_costs", "FLOAT DEFAULT 0"),
+        ("total_invoiced", "FLOAT DEFAULT 0"),
+    ],
+    "table_versions": [
+        ("updated_at", "DATETIME"),
+    ],
+}
+
+logger = logging.getLogger(__name__)
+
+# Rows updated per statement by backfills, keeps write locks short
+BACKFILL_BATCH_SIZE = 10000
+
+
+def add_missing_columns(engine: Engine) -> list:
+    """Add columns declared in ADDED_COLUMNS that the database lacks"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+
+    with engine.begin() as conn:
+        for table, columns in ADDED_COLUMNS.items():
+            if table not in existing_tables:
+                continue
+            present = {column["name"] for column in inspector.get_columns(table)}
+            for name, sql_type in columns:
+                if name not in present:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}"))
+                    added.append(f"{table}.{name}")
+
+    return added
+
+
+def add_missing_indexes(engine: Engine) -> list:
+    """
+    Create indexes declared on the models that the database lacks
+
+    Each index is built with its own CREATE INDEX statement, so existing
+    tables are indexed in place without being rebuilt. Progress is logged
+    per index since building one over a large table can take a while.
+    """
+    inspector = inspect(engine)
+    missing = []
+
+    for table in models.Base.metadata.sorted_tables:
+        present = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing.extend(index for index in table.indexes if index.name not in present)
+
+    created = []
+    for position, index in enumerate(missing, start=1):
+        columns = ", ".join(column.name for column in index.columns)
+        logger.info("Creating index %s on %s(%s) [%d/%d]",
+                    index.name, index.table.name, columns, position, len(missing))
+        started = time.perf_counter()
+        index.create(bind=engine)
+        logger.info("Created index %s in %.2fs", index.name, time.perf_counter() - started)
+        created.append(index.name)
+
+    return created
+
+
+def backfill_worklog_totals(engine: Engine, only_missing: bool = False) -> int:
+    """
+    Recompute stored hours_worked and gross_pay for work logs
+
+    Runs as set-based UPDATE statements over id ranges so no ORM objects
+    are loaded. Gross pay uses each employee's current hourly rate.
+
+    Args:
+        engine: Engine bound to the database to update
+        only_missing: Only fill rows whose hours_worked is NULL
+
+    Returns:
+        Number of rows updated
+    """
+    worklogs = models.WorkLog.__table__
+    hourly_rate = (
+        select(models.Employee.hourly_rate)
+        .where(models.Employee.id == worklogs.c.employee_id)
+        .scalar_subquery()
+    )
+    hours = hours_worked_expression()
+
+    with engine.connect() as conn:
+        max_id = conn.execute(select(func.max(worklogs.c.id))).scalar() or 0
+
+    updated = 0
+    for first_id in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+        statement = (
+            worklogs.update()
+            .where(worklogs.c.id >= first_id, worklogs.c.id < first_id + BACKFILL_BATCH_SIZE)
+            .values(
+                hours_worked=hours,
+                gross_pay=hours * func.coalesce(hourly_rate, 0),
+            )
+        )
+        if only_missing:
+            statement = statement.where(worklogs.c.hours_worked.is_(None))
+
+        with engine.begin() as conn:
+            updated += conn.execute(statement).rowcount
+
+    # Core updates skip the flush hook, so invalidate cached hours and payroll here
+    if updated:
+        with Session(engine) as db:
+            versions.bump(db, worklogs.name)
+            db.commit()
+
+    return updated
+
+
+def stored_version(engine: Engine) -> int:
+    """Schema version recorded in the database, 0 if none was recorded yet"""
+    schema_version = models.SchemaVersion.__table__
+    with engine.connect() as conn:
+        try:
+            version = conn.execute(select(schema_version.c.version)).scalar()
+        except OperationalError:
+            # No schema_version table: empty database or older than versioning
+            return 0
+    return version or 0
+
+
+def _stamp(engine: Engine) -> None:
+    schema_version = models.SchemaVersion.__table__
+    with engine.begin() as conn:
+        conn.execute(schema_version.delete())
+        conn.execute(schema_version.insert().values(id=1, version=SCHEMA_VERSION))
+
+
+def check_schema(engine: Engine = default_engine, auto_upgrade: bool = SCHEMA_AUTO_UPGRADE) -> int:
+    """
+    Make sure the database schema matches this code before serving requests
+
+    Args:
+        engine: Engine bound to the database to check
+        auto_upgrade: Upgrade an outdated database instead of refusing to start
+
+    Returns:
+        Schema version of the database
+
+    Raises:
+        RuntimeError: If the database is outdated and auto_upgrade is off, or
+            was upgraded by newer code
+    """
+    version = stored_version(engine)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {version} is newer than this code ({SCHEMA_VERSION})"
+        )
+    if version < SCHEMA_VERSION:
+        if not auto_upgrade:
+            raise RuntimeError(
+                f"Database schema version {version} is older than {SCHEMA_VERSION}; "
+                "run `python -m construction_erp.migrations upgrade`"
+            )
+        logger.info("Upgrading database schema from version %d to %d", version, SCHEMA_VERSION)
+        upgrade(engine)
+    return SCHEMA_VERSION
+
+
+def upgrade(engine: Engine = default_engine) -> None:
+    """Bring an existing database up to the current models"""
+    existing_tables = set(inspect(engine).get_table_names())
+    models.Base.metadata.create_all(bind=engine)
+
+    added = add_missing_columns(engine)
+    if "worklogs.hours_worked" in added:
+        backfill_worklog_totals(engine, only_missing=True)
+    if "projects.total_costs" in added or "projects.total_invoiced" in added:
+        rollups.reconcile(engine)
+
+    add_missing_indexes(engine)
+
+    # Seed the dashboard summary the first time it appears in an old database
+    if existing_tables and models.FinancialSummary.__tablename__ not in existing_tables:
+        summary.rebuild(engine)
+
+    _stamp(engine)
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "upgrade"
+
+    if command == "upgrade":
+        before = stored_version(default_engine)
+        upgrade()
+        print(f"Database schema is up to date (version {before} -> {SCHEMA_VERSION})")
+    elif command == "status":
+        version = stored_version(default_engine)
+        print(f"Database schema version {version}, code expects {SCHEMA_VERSION}")
+        if version != SCHEMA_VERSION:
+            return 1
+    elif command == "backfill-worklogs":
+        upgrade()
+        updated = backfill_worklog_totals(default_engine)
+        print(f"Recomputed hours and gross pay for {updated} work logs")
+    elif command == "rebuild-summaries":
+        upgrade()
+        written = summary.rebuild(default_engine)
+        print(f"Rebuilt {written} financial summary rows")
+    elif command == "reconcile-projects":
+        fix = "--check" not in argv[1:]
+        if fix:
+            upgrade()
+        else:
+            # A check must not write, so an outdated schema fails instead of upgrading
+            version = stored_version(default_engine)
+            if version != SCHEMA_VERSION:
+                print(f"Database schema version {version}, code expects {SCHEMA_VERSION}")
+                return 1
+        drift = rollups.reconcile(default_engine, fix=fix)
+        for item in drift:
+            print(
+                f"Project {item['project_id']}: costs {item['stored_costs']} -> {item['actual_costs']}, "
+                f"invoiced {item['stored_invoiced']} -> {item['actual_invoiced']}"
+            )
+        action = "Fixed" if fix else "Found"
+        print(f"{action} {len(drift)} projects with drifted rollups")
+        if drift and not fix:
+            return 1
+    else:
+        print(f"Unknown command: {command}")
+        print("Commands: upgrade, status, backfill-worklogs, rebuild-summaries, reconcile-projects")
+        return 2
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
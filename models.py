@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, Date, Time, Text
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, Date, DateTime, Time, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, date, time
 
@@ -26,23 +26,51 @@ class WorkLog(Base):
     entry_time = Column(Time)
     exit_time = Column(Time)
     lunch_duration = Column(Integer)  # in minutes
+    hours_worked = Column(Float)  # stored at write time, see set_totals()
+    gross_pay = Column(Float)  # hours_worked * hourly rate in effect at write time
     
     # Relationships
     employee = relationship("Employee", back_populates="worklogs")
     
-    @property
-    def hours_worked(self):
-        """Calculate hours worked with lunch deduction"""
-        entry_datetime = datetime.combine(date.today(), self.entry_time)
-        exit_datetime = datetime.combine(date.today(), self.exit_time)
-        
-        # Calculate total duration in hours
-        duration = (exit_datetime - entry_datetime).total_seconds() / 3600
+    __table_args__ = (
+        Index("ix_worklogs_employee_date", "employee_id", "date"),
+        # Covering index so period sums of hours and pay never touch the table
+        Index("ix_worklogs_date_totals", "date", "employee_id", "hours_worked", "gross_pay"),
+    )
+    
+    # Lunch rule: 30 minutes are deducted when lunch took longer than 30
+    # minutes. payroll.py applies these constants in SQL as well.
+    LUNCH_DEDUCTION_AFTER_MINUTES = 30
+    LUNCH_DEDUCTION_HOURS = 0.5
+    
+    @staticmethod
+    def hours_from_seconds(entry_seconds, exit_seconds, lunch_duration):
+        """Calculate hours worked with lunch deduction from times as seconds since midnight"""
+        duration = (exit_seconds - entry_seconds) / 3600
         
-        # Apply lunch deduction (30 minutes if lunch_duration > 30)
-        lunch_deduction = 0.5 if self.lunch_duration > 30 else 0
+        lunch_deduction = (
+            WorkLog.LUNCH_DEDUCTION_HOURS if lunch_duration > WorkLog.LUNCH_DEDUCTION_AFTER_MINUTES else 0
+        )
         
         return max(0, duration - lunch_deduction)
+    
+    @staticmethod
+    def calculate_hours(entry_time, exit_time, lunch_duration):
+        """Calculate hours worked with lunch deduction"""
+        entry_datetime = datetime.combine(date.today(), entry_time)
+        exit_datetime = datetime.combine(date.today(), exit_time)
+        midnight = datetime.combine(date.today(), time())
+        
+        return WorkLog.hours_from_seconds(
+            (entry_datetime - midnight).total_seconds(),
+            (exit_datetime - midnight).total_seconds(),
+            lunch_duration
+        )
+    
+    def set_totals(self, hourly_rate):
+        """Store hours worked and gross pay at the given hourly rate"""
+        self.hours_worked = self.calculate_hours(self.entry_time, self.exit_time, self.lunch_duration)
+        self.gross_pay = self.hours_worked * (hourly_rate or 0)
 
 
 class Payment(Base):
@@ -52,7 +80,7 @@ class Payment(Base):
     employee_id = Column(Integer, ForeignKey("employees.id"))
     amount = Column(Float)
     payment_method = Column(String)  # "cash" or "check"
-    payment_date = Column(Date)
+    payment_date = Column(Date, index=True)
     notes = Column(Text, nullable=True)
     
     # Relationships
@@ -68,27 +96,25 @@ class Project(Base):
     start_date = Column(Date)
     end_date = Column(Date, nullable=True)
     
+    # Rollups kept in sync by rollups.adjust_project() on every cost and invoice write
+    total_costs = Column(Float, default=0.0)
+    total_invoiced = Column(Float, default=0.0)
+    
     # Relationships
     costs = relationship("ProjectCost", back_populates="project")
     invoices = relationship("Invoice", back_populates="project")
     
-    @property
-    def total_costs(self):
-        """Calculate total costs for the project"""
-        return sum(cost.amount for cost in self.costs)
-    
     @property
     def profit_margin(self):
         """Calculate profit margin based on invoices and costs"""
-        total_invoiced = sum(invoice.amount_charged for invoice in self.invoices)
-        return total_invoiced - self.total_costs
+        return (self.total_invoiced or 0) - (self.total_costs or 0)
 
 
 class ProjectCost(Base):
     __tablename__ = "project_costs"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
     cost_type = Column(String)  # "material" or "employee"
     description = Column(String)
     amount = Column(Float)
@@ -103,10 +129,14 @@ class Invoice(Base):
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
     amount_charged = Column(Float)
-    invoice_date = Column(Date)
+    invoice_date = Column(Date, index=True)
     
     # Relationships
     project = relationship("Project", back_populates="invoices")
+    
+    __table_args__ = (
+        Index("ix_invoices_project_date", "project_id", "invoice_date"),
+    )
 
 
 class AccountsPayable(Base):
@@ -116,11 +146,15 @@ class AccountsPayable(Base):
     supplier = Column(String)
     description = Column(String)
     amount = Column(Float)
-    due_date = Column(Date)
+    due_date = Column(Date, index=True)
     payment_method = Column(String)
     category = Column(String)
     status = Column(String)  # "pending" or "paid"
     notes = Column(Text, nullable=True)
+    
+    __table_args__ = (
+        Index("ix_accounts_payable_status_due", "status", "due_date"),
+    )
 
 
 class PaidAccount(Base):
@@ -129,7 +163,7 @@ class PaidAccount(Base):
     id = Column(Integer, primary_key=True, index=True)
     supplier = Column(String)
     amount_paid = Column(Float)
-    payment_date = Column(Date)
+    payment_date = Column(Date, index=True)
     payment_method = Column(String)
     check_number = Column(String, nullable=True)
     check_bank = Column(String, nullable=True)
@@ -143,7 +177,36 @@ class Expense(Base):
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String)
     amount = Column(Float)
-    expense_date = Column(Date)
+    expense_date = Column(Date, index=True)
     category = Column(String)
     payment_method = Column(String)
     notes = Column(Text, nullable=True)
+
+
+class FinancialSummary(Base):
+    __tablename__ = "financial_summaries"
+
+    # One row per day and one per month, maintained by summary.record()
+    period_type = Column(String, primary_key=True)  # "day" or "month"
+    period_start = Column(Date, primary_key=True)
+    payroll_total = Column(Float, default=0)
+    invoice_total = Column(Float, default=0)
+    expense_total = Column(Float, default=0)
+    paid_total = Column(Float, default=0)
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    # Change counter per table, advanced on every write (see versions.py)
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, default=0)
+    updated_at = Column(DateTime, nullable=True)  # UTC time of the last change
+
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+
+    # Single row: schema version the database was last upgraded to (see migrations.py)
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
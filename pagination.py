@@ -0,0 +1,111 @@
+"""
+Keyset (cursor) pagination over (date, id)
+
+A cursor names the last row of the previous page, so every page is read
+with an indexed range scan of PAGE_SIZE rows no matter how deep it is,
+unlike OFFSET which scans and discards all earlier rows.
+
+Rows without a date are kept in the list, after all dated rows when
+newest first and before them when oldest first (SQLite's own NULL order),
+with "null" in place of the date in their cursors.
+"""
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from sqlalchemy import and_, func, or_
+
+# Rows per page for paginated lists
+PAGE_SIZE = 50
+
+# Stands for a NULL date in cursors
+NULL_DATE = "null"
+
+
+def encode_cursor(sort_date: Optional[date], row_id: int) -> str:
+    """Encode the position of a row as an opaque URL-safe cursor"""
+    return f"{sort_date.isoformat() if sort_date is not None else NULL_DATE}_{row_id}"
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[Optional[date], int]]:
+    """Decode a cursor created by encode_cursor, raising ValueError if malformed"""
+    if not cursor:
+        return None
+    sort_date, _, row_id = cursor.partition("_")
+    return (None if sort_date == NULL_DATE else date.fromisoformat(sort_date)), int(row_id)
+
+
+def keyset_page(query, date_column, id_column, cursor: Optional[str] = None,
+                page_size: int = PAGE_SIZE, descending: bool = True) -> Tuple[List[Any], Optional[str]]:
+    """
+    Get one page of a query ordered by (date_column, id_column)
+
+    Args:
+        query: Filtered ORM query
+        date_column: Date column to order by
+        id_column: Primary key column, breaks ties between equal dates
+        cursor: Cursor returned with the previous page, None for the first page
+        page_size: Maximum number of rows to return
+        descending: Newest first when True
+
+    Returns:
+        Rows of the page and the cursor of the next page (None on the last page)
+    """
+    position = decode_cursor(cursor)
+    if position:
+        sort_date, row_id = position
+        if sort_date is None:
+            # Undated rows come last when descending, first when ascending
+            if descending:
+                query = query.filter(date_column.is_(None), id_column < row_id)
+            else:
+                query = query.filter(or_(
+                    date_column.isnot(None),
+                    and_(date_column.is_(None), id_column > row_id)
+                ))
+        elif descending:
+            query = query.filter(or_(
+                date_column < sort_date,
+                and_(date_column == sort_date, id_column < row_id),
+                date_column.is_(None)
+            ))
+        else:
+            query = query.filter(or_(
+                date_column > sort_date,
+                and_(date_column == sort_date, id_column > row_id)
+            ))
+
+    # SQLite sorts NULL below every date, which matches the filters above
+    if descending:
+        query = query.order_by(date_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(date_column, id_column)
+
+    # Fetch one extra row to know whether another page follows
+    rows = query.limit(page_size + 1).all()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, date_column.key), getattr(last, id_column.key))
+
+    return rows, next_cursor
+
+
+def totals(query, amount_column) -> Dict[str, Any]:
+    """Count and sum a filtered query in SQL"""
+    count, total = query.with_entities(
+        func.count(), func.coalesce(func.sum(amount_column), 0.0)
+    ).order_by(None).one()
+    return {"count": count, "total": total}
+
+
+def page_url(request, **params) -> str:
+    """URL of the current page with some query parameters replaced or removed (None)"""
+    query = dict(request.query_params)
+    for key, value in params.items():
+        if value is None:
+            query.pop(key, None)
+        else:
+            query[key] = value
+    return f"{request.url.path}?{urlencode(query)}" if query else request.url.path
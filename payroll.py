@@ -0,0 +1,172 @@
+from sqlalchemy import Integer, and_, case, cast, func, select
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import List, Dict, Any
+
+from construction_erp import models
+
+# Work log rows fetched per batch by calculate_payroll_batch
+BATCH_SIZE = 10000
+
+
+def _seconds_of_day(column):
+    """SQL expression for a stored TIME value as seconds since midnight"""
+    # SQLite stores times as "HH:MM:SS.ffffff"; strftime('%s') parses them
+    # against a fixed reference date, so the difference of two is exact.
+    return cast(func.strftime("%s", column), Integer)
+
+
+def hours_worked_expression():
+    """SQL expression mirroring WorkLog.calculate_hours for a single row"""
+    duration = (
+        _seconds_of_day(models.WorkLog.exit_time) - _seconds_of_day(models.WorkLog.entry_time)
+    ) / 3600.0
+
+    lunch_deduction = case(
+        (models.WorkLog.lunch_duration > models.WorkLog.LUNCH_DEDUCTION_AFTER_MINUTES,
+         models.WorkLog.LUNCH_DEDUCTION_HOURS),
+        else_=0.0
+    )
+    hours = duration - lunch_deduction
+
+    return case((hours > 0, hours), else_=0.0)
+
+
+def calculate_payroll(db: Session, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+    """
+    Calculate hours and amount due for every employee in one grouped query
+
+    Args:
+        db: Database session
+        start_date: First day of the period (inclusive)
+        end_date: Last day of the period (inclusive)
+
+    Returns:
+        One entry per employee with "employee", "total_hours" and "amount_due"
+    """
+    total_hours = func.coalesce(func.sum(models.WorkLog.hours_worked), 0.0).label("total_hours")
+
+    rows = (
+        db.query(models.Employee, total_hours)
+        .outerjoin(
+            models.WorkLog,
+            and_(
+                models.WorkLog.employee_id == models.Employee.id,
+                models.WorkLog.date >= start_date,
+                models.WorkLog.date <= end_date,
+            ),
+        )
+        .group_by(models.Employee.id)
+        .order_by(models.Employee.id)
+        .all()
+    )
+
+    return [
+        {
+            "employee": employee,
+            "total_hours": hours,
+            "amount_due": hours * (employee.hourly_rate or 0),
+        }
+        for employee, hours in rows
+    ]
+
+
+def calculate_daily_payroll(db: Session, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+    """
+    Calculate hours and amount due per employee per day in one grouped query
+
+    Only days with at least one work log are returned.
+    """
+    total_hours = func.sum(models.WorkLog.hours_worked).label("total_hours")
+
+    rows = (
+        db.query(models.Employee, models.WorkLog.date, total_hours)
+        .join(models.WorkLog, models.WorkLog.employee_id == models.Employee.id)
+        .filter(
+            models.WorkLog.date >= start_date,
+            models.WorkLog.date <= end_date,
+        )
+        .group_by(models.Employee.id, models.WorkLog.date)
+        .order_by(models.Employee.id, models.WorkLog.date)
+        .all()
+    )
+
+    return [
+        {
+            "employee": employee,
+            "date": work_date,
+            "total_hours": hours,
+            "amount_due": hours * (employee.hourly_rate or 0),
+        }
+        for employee, work_date, hours in rows
+    ]
+
+
+def _sum_raw_hours(db: Session, start_date: date, end_date: date):
+    """Per-employee and per-(employee, day) hours recomputed from raw work log times"""
+    statement = (
+        select(
+            models.WorkLog.employee_id,
+            models.WorkLog.date,
+            _seconds_of_day(models.WorkLog.entry_time),
+            _seconds_of_day(models.WorkLog.exit_time),
+            func.coalesce(models.WorkLog.lunch_duration, 0),
+        )
+        .where(
+            models.WorkLog.date >= start_date,
+            models.WorkLog.date <= end_date,
+            models.WorkLog.entry_time.isnot(None),
+            models.WorkLog.exit_time.isnot(None),
+        )
+        .execution_options(yield_per=BATCH_SIZE)
+    )
+
+    by_employee = {}
+    by_day = {}
+    for employee_id, work_date, entry, exit_, lunch in db.execute(statement):
+        hours = models.WorkLog.hours_from_seconds(entry, exit_, lunch)
+        by_employee[employee_id] = by_employee.get(employee_id, 0.0) + hours
+        by_day[(employee_id, work_date)] = by_day.get((employee_id, work_date), 0.0) + hours
+    return by_employee, by_day
+
+
+def calculate_payroll_batch(db: Session, start_date: date, end_date: date) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Compute per-employee and per-day hours and pay from raw work log times
+
+    Unlike calculate_payroll, which sums the hours stored at write time,
+    this recomputes hours from entry/exit times and lunch durations, for
+    checking the stored totals. Pages and reports use the stored sums,
+    which are several times faster.
+
+    Returns:
+        {"employees": same rows as calculate_payroll,
+         "days": same rows as calculate_daily_payroll}
+    """
+    by_employee, by_day = _sum_raw_hours(db, start_date, end_date)
+
+    employees = db.query(models.Employee).order_by(models.Employee.id).all()
+    employees_by_id = {employee.id: employee for employee in employees}
+
+    employee_rows = []
+    for employee in employees:
+        hours = by_employee.get(employee.id, 0.0)
+        employee_rows.append({
+            "employee": employee,
+            "total_hours": hours,
+            "amount_due": hours * (employee.hourly_rate or 0),
+        })
+
+    day_rows = []
+    for (employee_id, work_date), hours in sorted(by_day.items()):
+        employee = employees_by_id.get(employee_id)
+        if employee is None:
+            continue
+        day_rows.append({
+            "employee": employee,
+            "date": work_date,
+            "total_hours": hours,
+            "amount_due": hours * (employee.hourly_rate or 0),
+        })
+
+    return {"employees": employee_rows, "days": day_rows}
@@ -0,0 +1,261 @@
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session, joinedload
+from datetime import date
+from typing import Optional, Dict, Any
+
+from construction_erp import models
+from construction_erp.payroll import calculate_payroll
+
+# Report type -> tables its data is read from
+REPORT_TABLES = {
+    "payroll": ("payments", "employees"),
+    "payment_method": ("payments",),
+    "hours_worked": ("worklogs", "employees"),
+    "project_billing": ("projects", "invoices", "project_costs"),
+    "project_cost": ("projects", "project_costs"),
+    "project_profit": ("projects", "invoices", "project_costs"),
+    "accounts_payable": ("accounts_payable",),
+    "paid_accounts": ("paid_accounts",),
+    "monthly_expense": ("expenses",),
+    "paid_by_method": ("paid_accounts",),
+    "payment_forecast": ("accounts_payable",),
+}
+
+
+def project_financials(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """
+    Invoiced, cost and profit figures for every project in one grouped query
+
+    Invoices are limited to the date range when one is given; costs have no
+    date and always count in full.
+
+    Returns:
+        Rows of (project, total_invoiced, total_costs, material_costs,
+        employee_costs, profit, profit_percentage)
+    """
+    invoice_filters = []
+    if start_date:
+        invoice_filters.append(models.Invoice.invoice_date >= start_date)
+    if end_date:
+        invoice_filters.append(models.Invoice.invoice_date <= end_date)
+
+    invoiced = (
+        select(
+            models.Invoice.project_id,
+            func.sum(models.Invoice.amount_charged).label("total_invoiced")
+        )
+        .where(*invoice_filters)
+        .group_by(models.Invoice.project_id)
+        .subquery()
+    )
+    costs = (
+        select(
+            models.ProjectCost.project_id,
+            func.sum(models.ProjectCost.amount).label("total_costs"),
+            func.sum(case((models.ProjectCost.cost_type == "material", models.ProjectCost.amount), else_=0.0)).label("material_costs"),
+            func.sum(case((models.ProjectCost.cost_type == "employee", models.ProjectCost.amount), else_=0.0)).label("employee_costs")
+        )
+        .group_by(models.ProjectCost.project_id)
+        .subquery()
+    )
+
+    total_invoiced = func.coalesce(invoiced.c.total_invoiced, 0.0)
+    total_costs = func.coalesce(costs.c.total_costs, 0.0)
+    profit = total_invoiced - total_costs
+    profit_percentage = case((total_invoiced > 0, profit / total_invoiced * 100), else_=0.0)
+
+    return (
+        db.query(
+            models.Project,
+            total_invoiced,
+            total_costs,
+            func.coalesce(costs.c.material_costs, 0.0),
+            func.coalesce(costs.c.employee_costs, 0.0),
+            profit,
+            profit_percentage
+        )
+        .outerjoin(invoiced, invoiced.c.project_id == models.Project.id)
+        .outerjoin(costs, costs.c.project_id == models.Project.id)
+        .order_by(models.Project.id)
+        .all()
+    )
+
+
+def build_report(db: Session, report_type: Optional[str], start_date: date, end_date: date) -> Optional[Dict[str, Any]]:
+    """
+    Build the data for one report
+
+    Args:
+        db: Database session
+        report_type: One of REPORT_TABLES, anything else yields no data
+        start_date: First day of the report period (inclusive)
+        end_date: Last day of the report period (inclusive)
+
+    Returns:
+        Report data dictionary as used by reports.html, or None
+    """
+    report_data = None
+    
+    if report_type == "payroll":
+        # Payroll Report
+        payments = db.query(models.Payment).options(
+            joinedload(models.Payment.employee)
+        ).filter(
+            models.Payment.payment_date >= start_date,
+            models.Payment.payment_date <= end_date
+        ).order_by(models.Payment.payment_date).all()
+        
+        report_data = {
+            "payments": payments,
+            "total": sum(payment.amount for payment in payments)
+        }
+    
+    elif report_type == "payment_method":
+        # Payment Method Report
+        payments = db.query(models.Payment).filter(
+            models.Payment.payment_date >= start_date,
+            models.Payment.payment_date <= end_date
+        ).all()
+        
+        cash_total = sum(payment.amount for payment in payments if payment.payment_method == "cash")
+        check_total = sum(payment.amount for payment in payments if payment.payment_method == "check")
+        
+        report_data = {
+            "cash_total": cash_total,
+            "check_total": check_total,
+            "total": cash_total + check_total
+        }
+    
+    elif report_type == "hours_worked":
+        # Hours Worked Report, from the same stored totals as /payroll
+        hours_data = calculate_payroll(db, start_date, end_date)
+        
+        report_data = {"hours_data": hours_data}
+    
+    elif report_type == "project_billing":
+        # Project Billing Report
+        billing_data = [
+            {
+                "project": project,
+                "total_invoiced": total_invoiced,
+                "total_costs": total_costs,
+                "profit": profit
+            }
+            for project, total_invoiced, total_costs, _, _, profit, _ in project_financials(db, start_date, end_date)
+        ]
+        
+        report_data = {"billing_data": billing_data}
+    
+    elif report_type == "project_cost":
+        # Project Cost Report
+        cost_data = [
+            {
+                "project": project,
+                "material_costs": material_costs,
+                "employee_costs": employee_costs,
+                "total_costs": material_costs + employee_costs
+            }
+            for project, _, _, material_costs, employee_costs, _, _ in project_financials(db)
+        ]
+        
+        report_data = {"cost_data": cost_data}
+    
+    elif report_type == "project_profit":
+        # Project Profit Margin Report
+        profit_data = [
+            {
+                "project": project,
+                "total_invoiced": total_invoiced,
+                "total_costs": total_costs,
+                "profit_margin": profit,
+                "profit_percentage": profit_percentage
+            }
+            for project, total_invoiced, total_costs, _, _, profit, profit_percentage in project_financials(db)
+        ]
+        
+        report_data = {"profit_data": profit_data}
+    
+    elif report_type == "accounts_payable":
+        # Accounts Payable Report
+        payables = db.query(models.AccountsPayable).filter(
+            models.AccountsPayable.due_date >= start_date,
+            models.AccountsPayable.due_date <= end_date,
+            models.AccountsPayable.status == "pending"
+        ).order_by(models.AccountsPayable.due_date).all()
+        
+        report_data = {
+            "payables": payables,
+            "total": sum(payable.amount for payable in payables)
+        }
+    
+    elif report_type == "paid_accounts":
+        # Paid Accounts Report
+        paid_accounts = db.query(models.PaidAccount).filter(
+            models.PaidAccount.payment_date >= start_date,
+            models.PaidAccount.payment_date <= end_date
+        ).order_by(models.PaidAccount.payment_date).all()
+        
+        report_data = {
+            "paid_accounts": paid_accounts,
+            "total": sum(account.amount_paid for account in paid_accounts)
+        }
+    
+    elif report_type == "monthly_expense":
+        # Monthly Expense Report
+        expenses = db.query(models.Expense).filter(
+            models.Expense.expense_date >= start_date,
+            models.Expense.expense_date <= end_date
+        ).order_by(models.Expense.expense_date).all()
+        
+        # Group by category
+        categories = {}
+        for expense in expenses:
+            if expense.category not in categories:
+                categories[expense.category] = 0
+            categories[expense.category] += expense.amount
+        
+        report_data = {
+            "expenses": expenses,
+            "categories": categories,
+            "total": sum(expense.amount for expense in expenses)
+        }
+    
+    elif report_type == "paid_by_method":
+        # Paid Accounts by Payment Method
+        paid_accounts = db.query(models.PaidAccount).filter(
+            models.PaidAccount.payment_date >= start_date,
+            models.PaidAccount.payment_date <= end_date
+        ).all()
+        
+        methods = {}
+        for account in paid_accounts:
+            if account.payment_method not in methods:
+                methods[account.payment_method] = 0
+            methods[account.payment_method] += account.amount_paid
+        
+        report_data = {
+            "methods": methods,
+            "total": sum(account.amount_paid for account in paid_accounts)
+        }
+    
+    elif report_type == "payment_forecast":
+        # Payment Forecast
+        payables = db.query(models.AccountsPayable).filter(
+            models.AccountsPayable.status == "pending"
+        ).order_by(models.AccountsPayable.due_date).all()
+        
+        # Group by month
+        forecast = {}
+        for payable in payables:
+            month_key = f"{payable.due_date.year}-{payable.due_date.month:02d}"
+            if month_key not in forecast:
+                forecast[month_key] = 0
+            forecast[month_key] += payable.amount
+        
+        report_data = {
+            "payables": payables,
+            "forecast": forecast,
+            "total": sum(payable.amount for payable in payables)
+        }
+    
+    return report_data
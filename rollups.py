@@ -0,0 +1,90 @@
+"""
+Stored project financial rollups
+
+Project.total_costs and Project.total_invoiced are adjusted with a single
+UPDATE in the same transaction as every project cost or invoice insert and
+delete. reconcile() recomputes them from the source rows to detect and fix
+drift (for example after editing the database by hand).
+"""
+from typing import Dict, List
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from construction_erp import models, versions
+
+
+def adjust_project(db: Session, project_id: int, costs: float = 0.0, invoiced: float = 0.0) -> None:
+    """Add amounts to a project's rollups (negative when a row is deleted)"""
+    if not project_id or not (costs or invoiced):
+        return
+
+    projects = models.Project.__table__
+    db.execute(
+        projects.update()
+        .where(projects.c.id == project_id)
+        .values(
+            total_costs=func.coalesce(projects.c.total_costs, 0.0) + costs,
+            total_invoiced=func.coalesce(projects.c.total_invoiced, 0.0) + invoiced,
+        )
+    )
+    versions.bump(db, projects.name)
+
+
+def reconcile(engine: Engine, fix: bool = True) -> List[Dict[str, float]]:
+    """
+    Compare stored rollups with sums of the source rows
+
+    Args:
+        engine: Engine bound to the database to check
+        fix: Overwrite drifted rollups with the recomputed values
+
+    Returns:
+        One entry per drifted project with stored and actual values
+    """
+    projects = models.Project.__table__
+    costs = (
+        select(func.sum(models.ProjectCost.amount))
+        .where(models.ProjectCost.project_id == projects.c.id)
+        .scalar_subquery()
+    )
+    invoiced = (
+        select(func.sum(models.Invoice.amount_charged))
+        .where(models.Invoice.project_id == projects.c.id)
+        .scalar_subquery()
+    )
+
+    with Session(engine) as db:
+        rows = db.execute(select(
+            projects.c.id,
+            projects.c.total_costs,
+            projects.c.total_invoiced,
+            func.coalesce(costs, 0.0),
+            func.coalesce(invoiced, 0.0),
+        )).all()
+
+        drift = []
+        for project_id, stored_costs, stored_invoiced, actual_costs, actual_invoiced in rows:
+            if (stored_costs is None or stored_invoiced is None
+                    or abs(stored_costs - actual_costs) > 0.005
+                    or abs(stored_invoiced - actual_invoiced) > 0.005):
+                drift.append({
+                    "project_id": project_id,
+                    "stored_costs": stored_costs,
+                    "actual_costs": actual_costs,
+                    "stored_invoiced": stored_invoiced,
+                    "actual_invoiced": actual_invoiced,
+                })
+
+        if fix and drift:
+            for item in drift:
+                db.execute(
+                    projects.update()
+                    .where(projects.c.id == item["project_id"])
+                    .values(total_costs=item["actual_costs"], total_invoiced=item["actual_invoiced"])
+                )
+            versions.bump(db, projects.name)
+            db.commit()
+
+    return drift
@@ -0,0 +1,177 @@
+"""
+Materialized daily and monthly financial totals for the dashboard
+
+Write routes call record() in the same session as the row they insert or
+delete, so the summary commits (or rolls back) together with it. rebuild()
+recomputes every row from the source tables.
+"""
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+from typing import Dict, List
+
+from construction_erp import models, versions
+
+# Summary kind -> FinancialSummary column
+TOTAL_COLUMNS = {
+    "payroll": "payroll_total",
+    "invoice": "invoice_total",
+    "expense": "expense_total",
+    "paid": "paid_total",
+}
+
+# Summary kind -> (amount column, date column) in the source table
+SOURCE_COLUMNS = {
+    "payroll": (models.Payment.amount, models.Payment.payment_date),
+    "invoice": (models.Invoice.amount_charged, models.Invoice.invoice_date),
+    "expense": (models.Expense.amount, models.Expense.expense_date),
+    "paid": (models.PaidAccount.amount_paid, models.PaidAccount.payment_date),
+}
+
+# Chart series name -> FinancialSummary column
+SERIES_COLUMNS = {
+    "revenue": "invoice_total",
+    "payroll": "payroll_total",
+    "expense": "expense_total",
+    "paid_accounts": "paid_total",
+}
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def month_start(day: date) -> date:
+    """Get the first day of the month containing the given date"""
+    return day.replace(day=1)
+
+
+def period_start(day: date, granularity: str) -> date:
+    """First day of the day, week (starting Monday) or month containing the given date"""
+    if granularity == "month":
+        return month_start(day)
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def periods(start: date, end: date, granularity: str) -> List[date]:
+    """Start of every period from the one containing start to the one containing end"""
+    result = []
+    current = period_start(start, granularity)
+    while current <= end:
+        result.append(current)
+        if granularity == "month":
+            current = (current + timedelta(days=32)).replace(day=1)
+        else:
+            current += timedelta(days=7 if granularity == "week" else 1)
+    return result
+
+
+def _upsert(period_type: str, period_start: date, totals: Dict[str, float]):
+    """Build an INSERT that adds the given totals to an existing summary row"""
+    table = models.FinancialSummary.__table__
+    values = {column: 0.0 for column in TOTAL_COLUMNS.values()}
+    values.update(totals)
+
+    statement = insert(table).values(period_type=period_type, period_start=period_start, **values)
+    return statement.on_conflict_do_update(
+        index_elements=["period_type", "period_start"],
+        set_={column: table.c[column] + statement.excluded[column] for column in totals},
+    )
+
+
+def record(db: Session, kind: str, on_date: date, amount: float) -> None:
+    """
+    Add an amount to the day and month totals for one summary kind
+
+    Pass a negative amount when the source row is deleted.
+    """
+    if not on_date or not amount:
+        return
+
+    totals = {TOTAL_COLUMNS[kind]: amount}
+    db.execute(_upsert("day", on_date, totals))
+    db.execute(_upsert("month", month_start(on_date), totals))
+
+
+def month_totals(db: Session, day: date) -> Dict[str, float]:
+    """Get the totals for the month containing the given date"""
+    row = db.query(models.FinancialSummary).filter(
+        models.FinancialSummary.period_type == "month",
+        models.FinancialSummary.period_start == month_start(day)
+    ).first()
+
+    return {
+        column: (getattr(row, column) or 0.0) if row else 0.0
+        for column in TOTAL_COLUMNS.values()
+    }
+
+
+def series(db: Session, granularity: str, start: date, end: date) -> Dict:
+    """
+    Totals per day, week or month between two dates, in one grouped query
+
+    Sums the daily summary rows into periods, so ranges may start and end
+    mid-month. Periods without activity are reported as zero.
+
+    Returns:
+        {"periods": [ISO dates], "series": {name: [totals]}} with one total
+        per period for every name in SERIES_COLUMNS
+    """
+    table = models.FinancialSummary.__table__
+    day = table.c.period_start
+    if granularity == "month":
+        bucket = func.strftime("%Y-%m-01", day)
+    elif granularity == "week":
+        # Monday on or before the day
+        bucket = func.date(day, "-6 days", "weekday 1")
+    else:
+        bucket = func.date(day)
+
+    rows = db.query(
+        bucket.label("period"),
+        *(func.sum(table.c[column]) for column in SERIES_COLUMNS.values())
+    ).filter(
+        table.c.period_type == "day",
+        day >= start,
+        day <= end
+    ).group_by(bucket).all()
+    totals = {period: values for period, *values in rows}
+
+    labels = [period.isoformat() for period in periods(start, end, granularity)]
+    empty = [0.0] * len(SERIES_COLUMNS)
+    result = {name: [] for name in SERIES_COLUMNS}
+    for label in labels:
+        for name, value in zip(SERIES_COLUMNS, totals.get(label, empty)):
+            result[name].append(round(value or 0.0, 2))
+    return {"periods": labels, "series": result}
+
+
+def rebuild(engine: Engine) -> int:
+    """
+    Recompute all summary rows from the source tables
+
+    Returns:
+        Number of summary rows written
+    """
+    with Session(engine) as db:
+        db.query(models.FinancialSummary).delete()
+
+        written = set()
+        for kind, (amount, on_date) in SOURCE_COLUMNS.items():
+            day_rows = db.query(on_date, func.sum(amount)).group_by(on_date).all()
+            for day, total in day_rows:
+                if day is None or not total:
+                    continue
+                totals = {TOTAL_COLUMNS[kind]: total}
+                db.execute(_upsert("day", day, totals))
+                db.execute(_upsert("month", month_start(day), totals))
+                written.update({("day", day), ("month", month_start(day))})
+
+        # Cached pages built from the old totals must not outlive the rebuild
+        source_tables = {on_date.class_.__tablename__ for _, on_date in SOURCE_COLUMNS.values()}
+        versions.bump(db, models.FinancialSummary.__tablename__, *source_tables)
+        db.commit()
+
+    return len(written)
@@ -0,0 +1,124 @@
+"""
+Jinja template loading: bytecode cache, warm-up and precompiled artifact
+
+Compiled templates are kept in a bytecode cache on disk (TEMPLATE_CACHE_DIR),
+shared by all workers and kept across restarts. warm_up() loads every
+template at startup so no request pays for compiling one.
+
+For deploys, `build` compiles all templates into a zip of Python modules
+(TEMPLATE_ARTIFACT). A manifest of template checksums is written next to
+it; the artifact is only used while it matches the templates on disk, so
+a stale build falls back to compiling from source.
+
+Usage:
+    python -m construction_erp.templating build [--output build/templates.zip]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import jinja2
+from fastapi.templating import Jinja2Templates
+
+from construction_erp.config import TEMPLATE_ARTIFACT, TEMPLATE_CACHE_DIR
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+DEFAULT_ARTIFACT = "build/templates.zip"
+
+logger = logging.getLogger(__name__)
+
+
+def source_checksums(directory: Path = TEMPLATE_DIR) -> Dict[str, str]:
+    """SHA-256 of every template source, keyed by template name"""
+    loader = jinja2.FileSystemLoader(str(directory))
+    return {
+        name: hashlib.sha256((directory / name).read_bytes()).hexdigest()
+        for name in loader.list_templates()
+    }
+
+
+def _manifest_path(artifact: str) -> str:
+    return artifact + ".json"
+
+
+def artifact_loader(artifact: Optional[str], directory: Path = TEMPLATE_DIR) -> Optional[jinja2.BaseLoader]:
+    """Loader for a precompiled artifact, None if it is missing or stale"""
+    if not artifact or not os.path.exists(artifact):
+        return None
+    try:
+        with open(_manifest_path(artifact)) as manifest:
+            built_from = json.load(manifest)
+    except (OSError, ValueError):
+        logger.warning("Ignoring template artifact %s: manifest missing or unreadable", artifact)
+        return None
+    if built_from != source_checksums(directory):
+        logger.warning("Ignoring template artifact %s: templates changed since it was built", artifact)
+        return None
+    return jinja2.ModuleLoader(artifact)
+
+
+def create_templates(directory: Path = TEMPLATE_DIR) -> Jinja2Templates:
+    """Jinja2Templates using the precompiled artifact or the bytecode cache"""
+    source_loader = jinja2.FileSystemLoader(str(directory))
+    compiled_loader = artifact_loader(TEMPLATE_ARTIFACT, directory)
+    if compiled_loader is not None:
+        loader = jinja2.ChoiceLoader([compiled_loader, source_loader])
+    else:
+        loader = source_loader
+
+    if TEMPLATE_CACHE_DIR:
+        os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+
+    return Jinja2Templates(
+        directory=str(directory),
+        loader=loader,
+        bytecode_cache=jinja2.FileSystemBytecodeCache(TEMPLATE_CACHE_DIR),
+        # Every template is loaded by warm_up(), keep them all
+        cache_size=-1,
+    )
+
+
+def warm_up(env: jinja2.Environment) -> int:
+    """Load (and compile if needed) every template, returns how many"""
+    started = time.perf_counter()
+    names = jinja2.FileSystemLoader(str(TEMPLATE_DIR)).list_templates()
+    for name in names:
+        env.get_template(name)
+    logger.info("Loaded %d templates in %.3fs", len(names), time.perf_counter() - started)
+    return len(names)
+
+
+def build(output: str, directory: Path = TEMPLATE_DIR) -> int:
+    """Compile all templates into a zip artifact with its checksum manifest"""
+    env = create_templates(directory).env
+    # Compile from source, not from a previously built artifact
+    env.loader = jinja2.FileSystemLoader(str(directory))
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    env.compile_templates(output, zip="deflated", ignore_errors=False)
+
+    checksums = source_checksums(directory)
+    with open(_manifest_path(output), "w") as manifest:
+        json.dump(checksums, manifest, indent=2, sort_keys=True)
+    return len(checksums)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Precompile Jinja templates")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--output", default=TEMPLATE_ARTIFACT or DEFAULT_ARTIFACT, help="zip file to write")
+    args = parser.parse_args(argv)
+
+    count = build(args.output)
+    print(f"Compiled {count} templates into {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
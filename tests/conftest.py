@@ -0,0 +1,93 @@
+"""
+Shared test setup
+
+Tests run against a throwaway SQLite database, emptied after every test.
+The repository root is the construction_erp package, so it is registered
+under that name whatever the checkout directory is called.
+
+Run from the repository root with:
+    python -m pytest tests
+"""
+import importlib.machinery
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Must be set before the database module creates its engines
+_database_dir = tempfile.mkdtemp(prefix="construction_erp_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_database_dir}/test.db"
+
+if "construction_erp" not in sys.modules:
+    _spec = importlib.machinery.ModuleSpec("construction_erp", None, is_package=True)
+    _spec.submodule_search_locations = [str(ROOT)]
+    sys.modules["construction_erp"] = importlib.util.module_from_spec(_spec)
+
+from construction_erp import models  # noqa: E402
+from construction_erp.cache import report_cache  # noqa: E402
+from construction_erp.database import engine, read_engine, SessionLocal  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    models.Base.metadata.create_all(bind=engine)
+    yield
+    read_engine.dispose()
+    engine.dispose()
+    shutil.rmtree(_database_dir, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def empty_database():
+    """Delete every row and cached report after each test"""
+    yield
+    with engine.begin() as conn:
+        for table in reversed(models.Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    report_cache.clear()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    from construction_erp.app import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def count_statements():
+    """Context manager collecting the SQL statements any engine runs inside it"""
+    @contextmanager
+    def counting():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+    return counting
@@ -0,0 +1,79 @@
+import hashlib
+import json
+
+import pytest
+
+from construction_erp import assets
+
+LIBRARY = b"/* chart library */"
+VENDOR_PATH = "vendor/chart.min.js"
+
+
+@pytest.fixture
+def static_dir(tmp_path, monkeypatch):
+    """Empty static/ and pins file, with downloads served from memory"""
+    static = tmp_path / "static"
+    (static / "css").mkdir(parents=True)
+    (static / "css" / "style.css").write_text("body {}")
+    monkeypatch.setattr(assets, "STATIC_DIR", static)
+    monkeypatch.setattr(assets, "VENDOR_PINS", tmp_path / "vendor.lock.json")
+    monkeypatch.setattr(assets, "VENDOR_ASSETS", {VENDOR_PATH: "https://cdn.example/chart.min.js"})
+    monkeypatch.setattr(assets, "_download", lambda url: LIBRARY)
+    return static
+
+
+def pin(digest=hashlib.sha256(LIBRARY).hexdigest()):
+    assets.VENDOR_PINS.write_text(json.dumps({VENDOR_PATH: digest}))
+
+
+def test_pin_records_the_downloaded_hash(static_dir):
+    assert assets.pin_vendor_assets() == {VENDOR_PATH: hashlib.sha256(LIBRARY).hexdigest()}
+    assert assets.vendor_pins() == {VENDOR_PATH: hashlib.sha256(LIBRARY).hexdigest()}
+
+
+def test_download_writes_content_matching_its_pin(static_dir):
+    pin()
+
+    assert assets.download_vendor_assets() == 1
+    assert (static_dir / VENDOR_PATH).read_bytes() == LIBRARY
+    assert assets.download_vendor_assets() == 0
+
+
+@pytest.mark.parametrize("pinned", [False, True])
+def test_download_rejects_unpinned_or_mismatched_content(static_dir, pinned):
+    if pinned:
+        pin("0" * 64)
+
+    with pytest.raises(RuntimeError):
+        assets.download_vendor_assets()
+    assert not (static_dir / VENDOR_PATH).exists()
+
+
+def test_build_includes_the_verified_library(static_dir, tmp_path):
+    pin()
+    assets.download_vendor_assets()
+
+    entries = assets.build(str(tmp_path / "build"))
+
+    assert set(entries) == {"css/style.css", VENDOR_PATH}
+    assert (tmp_path / "build" / entries[VENDOR_PATH]).read_bytes() == LIBRARY
+
+
+def test_build_fails_without_the_library_or_with_altered_content(static_dir, tmp_path):
+    pin()
+    with pytest.raises(RuntimeError, match="missing"):
+        assets.build(str(tmp_path / "build"))
+
+    (static_dir / "vendor").mkdir()
+    (static_dir / VENDOR_PATH).write_bytes(LIBRARY + b"alert(1)")
+    with pytest.raises(RuntimeError, match="expected"):
+        assets.build(str(tmp_path / "build"))
+    assert not (tmp_path / "build").exists()
+
+
+def test_build_command_fails_instead_of_falling_back_to_the_cdn(static_dir, tmp_path, capsys):
+    pin()
+
+    assert assets.main(["build", "--no-download", "--output", str(tmp_path / "build")]) == 1
+    assert "missing" in capsys.readouterr().out
+    assert assets.main(["build", "--output", str(tmp_path / "build")]) == 0
@@ -0,0 +1,61 @@
+from datetime import date
+
+from construction_erp.cache import VersionedLRUCache, report_cache
+
+REPORT_URL = "/reports?report_type=monthly_expense&start_date=2024-01-01&end_date=2024-12-31"
+
+
+def add_expense(client, amount, category="Fuel"):
+    response = client.post("/financials/expenses", data={
+        "description": "Diesel",
+        "amount": amount,
+        "expense_date": date(2024, 3, 15).isoformat(),
+        "category": category,
+        "payment_method": "card",
+    }, follow_redirects=False)
+    assert response.status_code == 303
+
+
+def test_get_returns_value_for_same_versions():
+    cache = VersionedLRUCache("test")
+    cache.set("key", {"expenses": 1}, [1, 2, 3])
+
+    assert cache.get("key", {"expenses": 1}) == [1, 2, 3]
+    assert cache.stats()["hits"] == 1
+
+
+def test_get_drops_entry_built_from_older_versions():
+    cache = VersionedLRUCache("test")
+    cache.set("key", {"expenses": 1}, [1, 2, 3])
+
+    assert cache.get("key", {"expenses": 2}) is None
+    assert cache.get("key", {"expenses": 1}) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_evicts_least_recently_used_entry():
+    cache = VersionedLRUCache("test", max_entries=2)
+    cache.set("a", {}, 1)
+    cache.set("b", {}, 2)
+    cache.get("a", {})
+    cache.set("c", {}, 3)
+
+    assert cache.get("b", {}) is None
+    assert cache.get("a", {}) == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_report_is_served_from_cache_until_a_write(client):
+    add_expense(client, 100.0)
+
+    first = client.get(REPORT_URL)
+    second = client.get(REPORT_URL)
+    assert "100.00" in first.text
+    assert second.text == first.text
+    assert report_cache.stats()["hits"] == 1
+
+    add_expense(client, 250.0, category="Tools")
+
+    third = client.get(REPORT_URL)
+    assert "250.00" in third.text
+    assert report_cache.stats()["invalidations"] == 1
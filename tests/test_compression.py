@@ -0,0 +1,69 @@
+import pytest
+
+from construction_erp import models
+
+
+@pytest.fixture
+def expenses(db):
+    db.add_all([
+        models.Expense(description=f"Fuel run {number}", amount=80.0 + number, category="vehicles",
+                       payment_method="card")
+        for number in range(100)
+    ])
+    db.commit()
+
+
+def requests_counted(client, route, status):
+    """Value of http_requests_total for a route label and status"""
+    prefix = f'http_requests_total{{method="GET",route="{route}",status="{status}"}} '
+    for line in client.get("/metrics").text.splitlines():
+        if line.startswith(prefix):
+            return float(line[len(prefix):])
+    return 0.0
+
+
+def test_large_json_is_gzipped_with_encoded_etag(client, expenses):
+    response = client.get("/api/expenses?limit=100", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].endswith('-gzip"')
+    assert "Accept-Encoding" in response.headers["vary"]
+
+
+def test_gzip_etag_revalidates(client, expenses):
+    first = client.get("/api/expenses?limit=100", headers={"Accept-Encoding": "gzip"})
+
+    second = client.get("/api/expenses?limit=100",
+                        headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]})
+
+    assert second.status_code == 304
+    assert second.headers["etag"] == first.headers["etag"]
+
+
+def test_small_responses_are_not_compressed(client):
+    response = client.get("/api/expenses", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_revalidation_keeps_its_route_label(client, expenses):
+    route = "/api/{entity}"
+    first = client.get("/api/expenses?limit=100", headers={"Accept-Encoding": "gzip"})
+    before = requests_counted(client, route, 304)
+    unmatched_before = requests_counted(client, "unmatched", 304)
+
+    response = client.get("/api/expenses?limit=100",
+                          headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]})
+
+    assert response.status_code == 304
+    assert requests_counted(client, route, 304) == before + 1
+    assert requests_counted(client, "unmatched", 304) == unmatched_before
+
+
+def test_compressed_body_decodes_to_identity_body(client, expenses):
+    identity = client.get("/api/expenses?limit=100", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/api/expenses?limit=100", headers={"Accept-Encoding": "gzip"})
+
+    # httpx decodes the gzip body transparently
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.content == identity.content
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from construction_erp import models
+from construction_erp.export import EXPORT_BATCH_SIZE, EXPORT_COLUMNS
+
+# More rows than one export batch, so chunk boundaries are exercised
+EXPENSE_COUNT = EXPORT_BATCH_SIZE + 250
+EXPORT_URL = "/reports/export?report_type={}&format={}&start_date=2024-01-01&end_date=2024-12-31"
+
+
+@pytest.fixture
+def expenses(db):
+    db.execute(insert(models.Expense), [
+        {"description": f"Expense {number}", "amount": 10.0 + number / 100, "category": "materials",
+         "payment_method": "card", "expense_date": date(2024, 1, 1) + timedelta(days=number % 300)}
+        for number in range(EXPENSE_COUNT)
+    ])
+    db.commit()
+
+
+@pytest.fixture
+def project(db):
+    project = models.Project(name="Warehouse", value=50000.0, start_date=date(2024, 1, 1))
+    project.costs = [models.ProjectCost(cost_type="material", description="Steel", amount=1000.0)]
+    project.invoices = [models.Invoice(amount_charged=4000.0, invoice_date=date(2024, 2, 1))]
+    db.add(project)
+    db.commit()
+
+
+def test_csv_export_streams_header_and_every_row(client, expenses):
+    response = client.get(EXPORT_URL.format("monthly_expense", "csv"))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="monthly_expense_2024-01-01_2024-12-31.csv"'
+    )
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == [header for _, header in EXPORT_COLUMNS["monthly_expense"]]
+    assert len(rows) == EXPENSE_COUNT + 1
+    assert rows[1] == ["Expense 0", "10.0", "2024-01-01", "materials", "card"]
+    dates = [row[2] for row in rows[1:]]
+    assert dates == sorted(dates)
+
+
+def test_ndjson_export_streams_one_object_per_row(client, expenses):
+    response = client.get(EXPORT_URL.format("monthly_expense", "ndjson"))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["content-disposition"].endswith('.ndjson"')
+    lines = response.text.splitlines()
+    assert len(lines) == EXPENSE_COUNT
+    first = json.loads(lines[0])
+    assert list(first) == [key for key, _ in EXPORT_COLUMNS["monthly_expense"]]
+    assert first == {"description": "Expense 0", "amount": 10.0, "date": "2024-01-01",
+                     "category": "materials", "payment_method": "card"}
+
+
+@pytest.mark.parametrize("export_format", ["csv", "ndjson"])
+def test_summary_report_export(client, project, export_format):
+    response = client.get(EXPORT_URL.format("project_profit", export_format))
+
+    assert response.status_code == 200
+    if export_format == "csv":
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[1:] == [["Warehouse", "4000.0", "1000.0", "3000.0", "75.0"]]
+    else:
+        assert [json.loads(line) for line in response.text.splitlines()] == [{
+            "project": "Warehouse", "total_invoiced": 4000.0, "total_costs": 1000.0,
+            "profit_margin": 3000.0, "profit_percentage": 75.0,
+        }]
+
+
+def test_empty_export_has_only_the_csv_header(client):
+    response = client.get(EXPORT_URL.format("monthly_expense", "csv"))
+
+    assert response.text.splitlines() == [",".join(header for _, header in EXPORT_COLUMNS["monthly_expense"])]
+
+
+@pytest.mark.parametrize("report_type, export_format", [("monthly_expense", "xlsx"), ("unknown", "csv")])
+def test_invalid_export_is_rejected(client, report_type, export_format):
+    assert client.get(EXPORT_URL.format(report_type, export_format)).status_code == 400
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from construction_erp import http_cache, models
+
+
+def utc_midnight_of_local_today():
+    local_midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return local_midnight.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def test_not_before_today_clamps_older_changes_to_midnight():
+    midnight = utc_midnight_of_local_today()
+
+    assert http_cache.not_before_today(None) == midnight
+    assert http_cache.not_before_today(midnight - timedelta(days=3)) == midnight
+    assert http_cache.not_before_today(midnight + timedelta(hours=1)) == midnight + timedelta(hours=1)
+
+
+def test_date_dependent_api_is_not_modified_only_since_today(client):
+    yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+    later = datetime.now(timezone.utc) + timedelta(minutes=1)
+
+    stale = client.get("/api/charts/projects", headers={"If-Modified-Since": format_datetime(yesterday, usegmt=True)})
+    fresh = client.get("/api/charts/projects", headers={"If-Modified-Since": format_datetime(later, usegmt=True)})
+
+    assert stale.status_code == 200
+    assert fresh.status_code == 304
+
+
+def test_etag_revalidation_returns_not_modified(client):
+    first = client.get("/api/charts/financials")
+
+    second = client.get("/api/charts/financials", headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.status_code == 304
+    assert second.headers["etag"] == first.headers["etag"]
+
+
+def test_report_with_default_dates_is_not_modified_only_since_today(client, db):
+    # Expenses last changed two days ago; the default date range moved since
+    db.add(models.TableVersion(table_name="expenses", version=1,
+                               updated_at=datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=2)))
+    db.commit()
+    yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+    headers = {"If-Modified-Since": format_datetime(yesterday, usegmt=True)}
+
+    response = client.get("/reports?report_type=monthly_expense", headers=headers)
+
+    assert response.status_code == 200
@@ -0,0 +1,27 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.responses import PlainTextResponse
+
+from construction_erp.instrumentation import InstrumentationMiddleware
+
+
+async def plain_app(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+@pytest.fixture
+def instrumented():
+    return TestClient(InstrumentationMiddleware(plain_app, sample_rate=1.0))
+
+
+def test_sampled_request_gets_server_timing(instrumented):
+    response = instrumented.get("/reports")
+
+    assert response.headers["server-timing"].startswith("sql;dur=")
+
+
+@pytest.mark.parametrize("path", ["/static/css/style.css", "/assets/css/style.1a2b3c4d5e6f.css"])
+def test_static_files_are_not_instrumented(instrumented, path):
+    response = instrumented.get(path)
+
+    assert "server-timing" not in response.headers
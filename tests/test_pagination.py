@@ -0,0 +1,123 @@
+import re
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from construction_erp import models
+from construction_erp.pagination import PAGE_SIZE, decode_cursor, encode_cursor, keyset_page, totals
+
+START = date(2024, 1, 1)
+# Three expenses a day, so pages split rows that share a date
+EXPENSE_COUNT = 2 * PAGE_SIZE + 7
+
+
+@pytest.fixture
+def expenses(db):
+    db.execute(insert(models.Expense), [
+        {"description": f"Expense {number}", "amount": float(number), "category": "fuel" if number % 2 else "tools",
+         "payment_method": "card", "expense_date": START + timedelta(days=number // 3)}
+        for number in range(EXPENSE_COUNT)
+    ])
+    db.commit()
+
+
+def all_pages(db, descending=True, **filters):
+    """Walk every page of the expenses query, returning the ids in order and the page count"""
+    query = db.query(models.Expense).filter_by(**filters)
+    ids, pages, cursor = [], 0, None
+    while True:
+        rows, cursor = keyset_page(query, models.Expense.expense_date, models.Expense.id, cursor,
+                                   descending=descending)
+        ids.extend(row.id for row in rows)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+def ordered_ids(db, descending=True, **filters):
+    rows = db.query(models.Expense).filter_by(**filters).all()
+    # NULL dates sort below every date, as in SQLite
+    key = lambda row: (row.expense_date is not None, row.expense_date or date.min, row.id)
+    return [row.id for row in sorted(rows, key=key, reverse=descending)]
+
+
+@pytest.mark.parametrize("sort_date", [date(2024, 3, 4), None])
+def test_cursor_round_trip(sort_date):
+    assert decode_cursor(encode_cursor(sort_date, 42)) == (sort_date, 42)
+    assert decode_cursor(None) is None
+    assert decode_cursor("") is None
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "2024-13-01_5", "2024-03-04_x", "null_"])
+def test_malformed_cursor_is_rejected(client, cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+    assert client.get("/invoices", params={"cursor": cursor}).status_code == 400
+    assert client.get("/financials", params={"expenses_cursor": cursor}).status_code == 400
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_pages_cover_every_row_once_in_order(db, expenses, descending):
+    ids, pages = all_pages(db, descending)
+
+    assert ids == ordered_ids(db, descending)
+    assert pages == 3
+
+
+@pytest.mark.parametrize("row_count, page_count", [(PAGE_SIZE, 1), (PAGE_SIZE + 1, 2)])
+def test_page_boundaries(db, row_count, page_count):
+    db.execute(insert(models.Expense), [
+        {"description": "Same day", "amount": 1.0, "expense_date": START} for _ in range(row_count)
+    ])
+    db.commit()
+
+    ids, pages = all_pages(db)
+
+    assert pages == page_count
+    assert ids == ordered_ids(db)
+
+
+def test_filtered_pages_and_totals(db, expenses):
+    ids, _ = all_pages(db, category="fuel")
+    fuel = db.query(models.Expense).filter_by(category="fuel")
+
+    assert ids == ordered_ids(db, category="fuel")
+    assert totals(fuel, models.Expense.amount) == {
+        "count": len(ids), "total": float(sum(number for number in range(EXPENSE_COUNT) if number % 2)),
+    }
+    assert totals(db.query(models.Expense).filter_by(category="none"), models.Expense.amount) == {
+        "count": 0, "total": 0.0,
+    }
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_rows_without_a_date_are_paged(db, expenses, descending):
+    db.execute(insert(models.Expense), [
+        {"description": "Undated", "amount": 5.0} for _ in range(PAGE_SIZE)
+    ])
+    db.commit()
+
+    ids, pages = all_pages(db, descending)
+
+    assert ids == ordered_ids(db, descending)
+    assert pages == 4
+
+
+def test_invoice_pages_follow_next_links(client, db):
+    project = models.Project(name="Warehouse", value=50000.0, start_date=START)
+    project.invoices = [
+        models.Invoice(amount_charged=100.0, invoice_date=START + timedelta(days=number // 2))
+        for number in range(PAGE_SIZE + 5)
+    ] + [models.Invoice(amount_charged=100.0)]
+    db.add(project)
+    db.commit()
+
+    first = client.get("/invoices", params={"project_id": project.id})
+    cursor = re.search(r"cursor=([^&\"]+)", first.text).group(1)
+    last = client.get("/invoices", params={"project_id": project.id, "cursor": cursor})
+
+    assert first.status_code == last.status_code == 200
+    assert "Next page" in first.text
+    assert "Next page" not in last.text
+    assert last.text.count("/invoices/delete/") == 6
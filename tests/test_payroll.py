@@ -0,0 +1,85 @@
+from datetime import date, time
+
+import pytest
+
+from construction_erp import models, payroll
+from construction_erp.database import engine
+from construction_erp.migrations import backfill_worklog_totals
+from construction_erp.reports import build_report
+
+START = date(2024, 3, 4)
+END = date(2024, 3, 10)
+
+# (employee, day, entry, exit, lunch minutes), around the edges of the lunch rule
+SHIFTS = [
+    (0, 4, time(8), time(16), 30),
+    (0, 4, time(17), time(19, 15), 31),
+    (0, 5, time(7, 30), time(15, 45), 0),
+    (0, 6, time(8, 0, 30), time(16, 10, 15), 60),
+    (1, 4, time(9), time(9, 15), 45),
+    (1, 7, time(6), time(18), 90),
+]
+
+
+@pytest.fixture
+def worklogs(db):
+    employees = [models.Employee(name="Ana", hourly_rate=20.0), models.Employee(name="Ben", hourly_rate=32.5)]
+    for employee, day, entry_time, exit_time, lunch_duration in SHIFTS:
+        worklog = models.WorkLog(employee=employees[employee], date=date(2024, 3, day),
+                                 entry_time=entry_time, exit_time=exit_time, lunch_duration=lunch_duration)
+        worklog.set_totals(employees[employee].hourly_rate)
+        db.add(worklog)
+    db.commit()
+
+
+def totals(rows, key):
+    return {key(row): (pytest.approx(row["total_hours"]), pytest.approx(row["amount_due"])) for row in rows}
+
+
+def by_employee(row):
+    return row["employee"].name
+
+
+def by_day(row):
+    return row["employee"].name, row["date"]
+
+
+def test_lunch_rule():
+    assert models.WorkLog.calculate_hours(time(8), time(16), 30) == 8.0
+    assert models.WorkLog.calculate_hours(time(8), time(16), 31) == 7.5
+    assert models.WorkLog.calculate_hours(time(9), time(9, 15), 45) == 0
+
+
+def test_batch_recomputation_matches_stored_totals(db, worklogs):
+    batch = payroll.calculate_payroll_batch(db, START, END)
+
+    # Stored totals come from WorkLog.calculate_hours at write time
+    assert totals(batch["employees"], by_employee) == totals(payroll.calculate_payroll(db, START, END), by_employee)
+    assert totals(batch["days"], by_day) == totals(payroll.calculate_daily_payroll(db, START, END), by_day)
+
+
+def test_sql_expression_matches_stored_totals(db, worklogs):
+    stored = {
+        worklog.id: (pytest.approx(worklog.hours_worked), pytest.approx(worklog.gross_pay))
+        for worklog in db.query(models.WorkLog)
+    }
+
+    # Recomputes every row with hours_worked_expression
+    backfill_worklog_totals(engine)
+    db.expire_all()
+
+    recomputed = {worklog.id: (worklog.hours_worked, worklog.gross_pay) for worklog in db.query(models.WorkLog)}
+    assert recomputed == stored
+
+
+def test_hours_worked_report_matches_payroll_page(db, worklogs):
+    report = build_report(db, "hours_worked", START, END)
+
+    assert totals(report["hours_data"], by_employee) == totals(payroll.calculate_payroll(db, START, END), by_employee)
+
+
+def test_daily_view_lists_stored_daily_totals(client, worklogs):
+    response = client.get("/payroll", params={"week_date": START.isoformat(), "view": "daily"})
+
+    assert response.status_code == 200
+    assert "2024-03-07" in response.text
@@ -0,0 +1,46 @@
+from datetime import date
+
+import pytest
+
+from construction_erp import models
+
+PROJECT_REPORTS = ["project_billing", "project_cost", "project_profit"]
+
+
+def add_projects(db, count):
+    first = db.query(models.Project).count()
+    for number in range(first, first + count):
+        project = models.Project(name=f"Project {number}", value=100000.0, start_date=date(2024, 1, 1))
+        project.costs = [
+            models.ProjectCost(cost_type="material", description="Concrete", amount=1000.0),
+            models.ProjectCost(cost_type="employee", description="Crew", amount=500.0),
+        ]
+        project.invoices = [models.Invoice(amount_charged=4000.0, invoice_date=date(2024, 2, 1))]
+        db.add(project)
+    db.commit()
+
+
+@pytest.mark.parametrize("report_type", PROJECT_REPORTS)
+def test_project_report_query_count_does_not_grow_with_projects(client, db, count_statements, report_type):
+    url = f"/reports?report_type={report_type}&start_date=2024-01-01&end_date=2024-12-31"
+
+    add_projects(db, 1)
+    with count_statements() as one_project:
+        assert client.get(url).status_code == 200
+
+    add_projects(db, 9)
+    with count_statements() as ten_projects:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert "Project 9" in response.text
+
+    assert len(ten_projects) == len(one_project), ten_projects
+
+
+def test_project_profit_figures(client, db):
+    add_projects(db, 1)
+
+    response = client.get("/reports?report_type=project_profit&start_date=2024-01-01&end_date=2024-12-31")
+
+    # 4000 invoiced - 1500 costs
+    assert "2500.00" in response.text
@@ -0,0 +1,112 @@
+from datetime import date
+
+import pytest
+
+from construction_erp import migrations, models, rollups, versions
+from construction_erp.database import engine
+
+
+@pytest.fixture
+def project(db):
+    project = models.Project(name="Warehouse", value=50000.0, start_date=date(2024, 1, 1),
+                             total_costs=0.0, total_invoiced=0.0)
+    db.add(project)
+    db.commit()
+    return project
+
+
+def post(client, url, data=None):
+    response = client.post(url, data=data or {}, follow_redirects=False)
+    assert response.status_code == 303
+
+
+def stored_totals(db, project):
+    db.expire_all()
+    return project.total_costs, project.total_invoiced
+
+
+def add_cost(client, project, amount):
+    post(client, "/project_costs", {"project_id": project.id, "cost_type": "material",
+                                    "description": "Steel", "amount": amount})
+
+
+def add_invoice(client, project, amount):
+    post(client, "/invoices", {"project_id": project.id, "amount_charged": amount,
+                               "invoice_date": "2024-02-01"})
+
+
+def test_cost_and_invoice_routes_adjust_rollups(client, db, project):
+    add_cost(client, project, 1000.0)
+    add_cost(client, project, 250.5)
+    add_invoice(client, project, 4000.0)
+    assert stored_totals(db, project) == (1250.5, 4000.0)
+
+    cost_id = db.query(models.ProjectCost.id).filter_by(amount=1000.0).scalar()
+    invoice_id = db.query(models.Invoice.id).scalar()
+    post(client, f"/project_costs/delete/{cost_id}")
+    post(client, f"/invoices/delete/{invoice_id}")
+
+    assert stored_totals(db, project) == (250.5, 0.0)
+    assert rollups.reconcile(engine, fix=False) == []
+
+
+def test_adjust_project_bumps_the_projects_version(db, project):
+    before = versions.snapshot(db, ["projects"])
+
+    rollups.adjust_project(db, project.id, costs=10.0)
+    db.commit()
+
+    assert versions.snapshot(db, ["projects"]) != before
+    assert stored_totals(db, project) == (10.0, 0.0)
+
+
+def test_adjust_project_ignores_zero_amounts_and_missing_project(db, project):
+    before = versions.snapshot(db, ["projects"])
+
+    rollups.adjust_project(db, project.id)
+    rollups.adjust_project(db, None, costs=10.0)
+    db.commit()
+
+    assert versions.snapshot(db, ["projects"]) == before
+
+
+def test_reconcile_finds_and_fixes_drift(client, db, project):
+    add_cost(client, project, 1000.0)
+    add_invoice(client, project, 4000.0)
+    project.total_costs = 5.0
+    project.total_invoiced = None
+    db.commit()
+
+    drift = rollups.reconcile(engine, fix=False)
+    assert drift == [{"project_id": project.id, "stored_costs": 5.0, "actual_costs": 1000.0,
+                      "stored_invoiced": None, "actual_invoiced": 4000.0}]
+    assert stored_totals(db, project) == (5.0, None)
+
+    assert rollups.reconcile(engine) == drift
+    assert stored_totals(db, project) == (1000.0, 4000.0)
+    assert rollups.reconcile(engine, fix=False) == []
+
+
+def test_reconcile_check_command_never_writes(db, project, capsys):
+    project.total_costs = 5.0
+    db.commit()
+    migrations._stamp(engine)
+
+    assert migrations.main(["reconcile-projects", "--check"]) == 1
+    assert stored_totals(db, project) == (5.0, 0.0)
+    assert "Found 1 projects" in capsys.readouterr().out
+
+    assert migrations.main(["reconcile-projects"]) == 0
+    assert stored_totals(db, project) == (0.0, 0.0)
+
+
+def test_reconcile_check_fails_on_outdated_schema(db, project, capsys):
+    project.total_costs = 5.0
+    db.commit()
+
+    assert migrations.main(["reconcile-projects", "--check"]) == 1
+    assert capsys.readouterr().out.strip() == (
+        f"Database schema version 0, code expects {migrations.SCHEMA_VERSION}"
+    )
+    assert migrations.stored_version(engine) == 0
+    assert stored_totals(db, project) == (5.0, 0.0)
@@ -0,0 +1,35 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+from prometheus_client import REGISTRY
+
+from construction_erp import migrations
+from construction_erp.database import engine
+
+GUNICORN_CONF = Path(__file__).resolve().parents[1] / "gunicorn.conf.py"
+
+
+@pytest.fixture
+def gunicorn_conf(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path / "metrics"))
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", GUNICORN_CONF)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("phase", ["imports", "setup", "schema_check", "templates"])
+def test_startup_phases_are_recorded(client, phase):
+    assert REGISTRY.get_sample_value("app_startup_seconds", {"phase": phase}) >= 0
+
+
+def test_gunicorn_master_upgrades_the_schema_before_workers_start(gunicorn_conf, monkeypatch):
+    assert migrations.stored_version(engine) < migrations.SCHEMA_VERSION
+
+    gunicorn_conf.on_starting(None)
+    assert migrations.stored_version(engine) == migrations.SCHEMA_VERSION
+
+    # Workers then find the schema current and never upgrade it themselves
+    monkeypatch.setattr(migrations, "upgrade", pytest.fail)
+    assert migrations.check_schema(engine) == migrations.SCHEMA_VERSION
@@ -0,0 +1,66 @@
+from datetime import date, time, timedelta
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import joinedload
+
+from construction_erp import config, models
+from construction_erp.reports import REPORT_TABLES
+
+PAGES = ["/", "/employees", "/worklogs", "/payroll", "/payroll?view=daily", "/projects", "/invoices",
+         "/financials"] + [f"/reports?report_type={report_type}" for report_type in REPORT_TABLES]
+
+
+@pytest.fixture
+def strict_loading(monkeypatch):
+    monkeypatch.setattr(config, "DB_STRICT_LOADING", True)
+
+
+@pytest.fixture
+def records(db):
+    """One row in every table, dated today so every page and report shows it"""
+    today = date.today()
+    employee = models.Employee(name="Ana", hourly_rate=20.0)
+    worklog = models.WorkLog(employee=employee, date=today, entry_time=time(8), exit_time=time(16),
+                             lunch_duration=30, hours_worked=8.0, gross_pay=160.0)
+    payment = models.Payment(employee=employee, amount=160.0, payment_method="cash", payment_date=today)
+    project = models.Project(name="Warehouse", value=50000.0, start_date=today, total_costs=1000.0,
+                             total_invoiced=4000.0)
+    project.costs = [models.ProjectCost(cost_type="material", description="Steel", amount=1000.0)]
+    project.invoices = [models.Invoice(amount_charged=4000.0, invoice_date=today)]
+    db.add_all([
+        employee, worklog, payment, project,
+        models.AccountsPayable(supplier="Acme", description="Lumber", amount=300.0,
+                               due_date=today + timedelta(days=5), payment_method="check",
+                               category="materials", status="pending"),
+        models.PaidAccount(supplier="Acme", amount_paid=200.0, payment_date=today, payment_method="cash"),
+        models.Expense(description="Fuel", amount=80.0, expense_date=today, category="vehicles",
+                       payment_method="card"),
+    ])
+    db.commit()
+
+
+def test_unloaded_relationship_raises_in_strict_mode(db, records, strict_loading):
+    worklog = db.query(models.WorkLog).one()
+
+    with pytest.raises(InvalidRequestError):
+        worklog.employee
+
+
+def test_loaded_relationship_works_in_strict_mode(db, records, strict_loading):
+    worklog = db.query(models.WorkLog).options(joinedload(models.WorkLog.employee)).one()
+
+    assert worklog.employee.name == "Ana"
+
+
+def test_relationships_lazy_load_by_default(db, records):
+    worklog = db.query(models.WorkLog).one()
+
+    assert worklog.employee.name == "Ana"
+
+
+@pytest.mark.parametrize("path", PAGES)
+def test_page_loads_everything_it_renders_up_front(client, records, strict_loading, path):
+    response = client.get(path)
+
+    assert response.status_code == 200
@@ -0,0 +1,212 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import func
+
+from construction_erp import models, summary
+from construction_erp.database import engine
+
+DAY = date(2024, 3, 15)
+MONTH = date(2024, 3, 1)
+
+
+@pytest.fixture
+def employee(db):
+    employee = models.Employee(name="Ana", hourly_rate=20.0)
+    db.add(employee)
+    db.commit()
+    return employee
+
+
+@pytest.fixture
+def project(db):
+    project = models.Project(name="Warehouse", value=50000.0, start_date=date(2024, 1, 1))
+    db.add(project)
+    db.commit()
+    return project
+
+
+def summary_rows(db):
+    """(period_type, period_start) -> (payroll, invoice, expense, paid) totals"""
+    db.expire_all()
+    return {
+        (row.period_type, row.period_start): (row.payroll_total, row.invoice_total, row.expense_total, row.paid_total)
+        for row in db.query(models.FinancialSummary)
+    }
+
+
+def post(client, url, data):
+    response = client.post(url, data=data, follow_redirects=False)
+    assert response.status_code == 303
+    return response
+
+
+def pay(client, employee, amount, on_date=DAY):
+    post(client, "/payroll", {"employee_id": employee.id, "amount": amount, "payment_method": "cash",
+                              "payment_date": on_date.isoformat()})
+
+
+def invoice(client, project, amount, on_date=DAY):
+    post(client, "/invoices", {"project_id": project.id, "amount_charged": amount,
+                               "invoice_date": on_date.isoformat()})
+
+
+def expense(client, amount, on_date=DAY):
+    post(client, "/financials/expenses", {"description": "Fuel", "amount": amount, "category": "vehicles",
+                                          "payment_method": "card", "expense_date": on_date.isoformat()})
+
+
+def paid(client, amount, on_date=DAY):
+    post(client, "/financials/paid", {"supplier": "Acme", "amount_paid": amount, "payment_method": "cash",
+                                      "payment_date": on_date.isoformat()})
+
+
+def test_payment_adds_to_day_and_month_payroll(client, db, employee):
+    pay(client, employee, 500.0)
+    pay(client, employee, 250.0, date(2024, 3, 20))
+
+    rows = summary_rows(db)
+    assert rows[("day", DAY)] == (500.0, 0.0, 0.0, 0.0)
+    assert rows[("day", date(2024, 3, 20))] == (250.0, 0.0, 0.0, 0.0)
+    assert rows[("month", MONTH)] == (750.0, 0.0, 0.0, 0.0)
+
+
+def test_invoice_adds_to_invoice_totals(client, db, project):
+    invoice(client, project, 4000.0)
+
+    assert summary_rows(db)[("month", MONTH)] == (0.0, 4000.0, 0.0, 0.0)
+
+
+def test_expense_and_paid_account_add_and_delete(client, db):
+    expense(client, 80.0)
+    paid(client, 300.0)
+    assert summary_rows(db)[("month", MONTH)] == (0.0, 0.0, 80.0, 300.0)
+
+    expense_id = db.query(models.Expense.id).scalar()
+    paid_id = db.query(models.PaidAccount.id).scalar()
+    post(client, f"/financials/delete/expense/{expense_id}", {})
+    post(client, f"/financials/delete/paid/{paid_id}", {})
+
+    rows = summary_rows(db)
+    assert rows[("day", DAY)] == (0.0, 0.0, 0.0, 0.0)
+    assert rows[("month", MONTH)] == (0.0, 0.0, 0.0, 0.0)
+
+
+def test_month_totals_reads_the_month_row(client, db, employee):
+    pay(client, employee, 500.0)
+    expense(client, 80.0)
+
+    totals = summary.month_totals(db, date(2024, 3, 31))
+
+    assert totals == {"payroll_total": 500.0, "invoice_total": 0.0, "expense_total": 80.0, "paid_total": 0.0}
+
+
+def test_rebuild_matches_incremental_totals(client, db, employee, project):
+    pay(client, employee, 500.0)
+    pay(client, employee, 125.5, date(2024, 4, 2))
+    invoice(client, project, 4000.0, date(2024, 2, 28))
+    expense(client, 80.0)
+    expense(client, 45.0)
+    paid(client, 300.0, date(2024, 4, 2))
+    first_expense_id = db.query(func.min(models.Expense.id)).scalar()
+    post(client, f"/financials/delete/expense/{first_expense_id}", {})
+    incremental = {key: values for key, values in summary_rows(db).items() if any(values)}
+
+    summary.rebuild(engine)
+
+    assert summary_rows(db) == incremental
+
+
+# (kind, date, amount) around a range that starts on a Wednesday mid-month
+# and ends on a Tuesday of the next month
+SERIES_START = date(2024, 3, 6)
+SERIES_END = date(2024, 4, 2)
+SERIES_ROWS = [
+    ("expense", date(2024, 2, 28), 10.0),
+    ("expense", date(2024, 3, 6), 1.0),
+    ("expense", date(2024, 3, 10), 2.0),
+    ("expense", date(2024, 3, 11), 4.0),
+    ("invoice", date(2024, 3, 31), 8.0),
+    ("expense", date(2024, 4, 1), 16.0),
+    ("payroll", date(2024, 4, 3), 32.0),
+]
+
+
+@pytest.fixture
+def series_rows(db):
+    for kind, on_date, amount in SERIES_ROWS:
+        summary.record(db, kind, on_date, amount)
+    db.commit()
+
+
+def test_week_series_aligns_partial_weeks_to_mondays(db, series_rows):
+    result = summary.series(db, "week", SERIES_START, SERIES_END)
+
+    assert result["periods"] == ["2024-03-04", "2024-03-11", "2024-03-18", "2024-03-25", "2024-04-01"]
+    assert all(date.fromisoformat(period).weekday() == 0 for period in result["periods"])
+    # The first week only counts days from the start date on
+    assert result["series"]["expense"] == [3.0, 4.0, 0.0, 0.0, 16.0]
+    assert result["series"]["revenue"] == [0.0, 0.0, 0.0, 8.0, 0.0]
+    assert result["series"]["payroll"] == [0.0] * 5
+
+
+def test_month_series_starts_mid_month(db, series_rows):
+    result = summary.series(db, "month", SERIES_START, SERIES_END)
+
+    assert result["periods"] == ["2024-03-01", "2024-04-01"]
+    assert result["series"]["expense"] == [7.0, 16.0]
+    assert result["series"]["revenue"] == [8.0, 0.0]
+
+
+def test_day_series_has_one_label_per_day(db, series_rows):
+    result = summary.series(db, "day", SERIES_START, SERIES_END)
+
+    assert len(result["periods"]) == (SERIES_END - SERIES_START).days + 1
+    assert result["periods"][0] == "2024-03-06"
+    assert result["periods"][-1] == "2024-04-02"
+    expense = dict(zip(result["periods"], result["series"]["expense"]))
+    assert {day: amount for day, amount in expense.items() if amount} == {
+        "2024-03-06": 1.0, "2024-03-10": 2.0, "2024-03-11": 4.0, "2024-04-01": 16.0,
+    }
+    for values in result["series"].values():
+        assert len(values) == len(result["periods"])
+
+
+def test_week_starting_on_sunday_only_counts_that_sunday(db, series_rows):
+    result = summary.series(db, "week", date(2024, 3, 10), date(2024, 3, 17))
+
+    assert result["periods"] == ["2024-03-04", "2024-03-11"]
+    assert result["series"]["expense"] == [2.0, 4.0]
+
+
+@pytest.mark.parametrize("granularity", summary.GRANULARITIES)
+def test_chart_route_returns_the_series(client, db, series_rows, granularity):
+    response = client.get("/api/charts/financials", params={
+        "granularity": granularity, "start_date": SERIES_START.isoformat(), "end_date": SERIES_END.isoformat(),
+    })
+
+    assert response.status_code == 200
+    expected = summary.series(db, granularity, SERIES_START, SERIES_END)
+    expected.update(granularity=granularity, start_date="2024-03-06", end_date="2024-04-02")
+    assert response.json() == expected
+
+
+@pytest.mark.parametrize("granularity, first, count", [
+    ("day", "2024-03-04", 30), ("week", "2024-01-15", 12), ("month", "2023-05-01", 12),
+])
+def test_chart_route_default_range_ends_with_the_current_period(client, granularity, first, count):
+    response = client.get("/api/charts/financials", params={"granularity": granularity, "end_date": "2024-04-02"})
+
+    periods = response.json()["periods"]
+    assert len(periods) == count
+    assert periods[0] == first
+    assert periods[-1] == summary.period_start(date(2024, 4, 2), granularity).isoformat()
+
+
+@pytest.mark.parametrize("params", [
+    {"granularity": "year"},
+    {"start_date": "2024-04-02", "end_date": "2024-03-06"},
+    {"granularity": "day", "start_date": "2020-01-01", "end_date": "2024-01-01"},
+])
+def test_chart_route_rejects_invalid_ranges(client, params):
+    assert client.get("/api/charts/financials", params=params).status_code == 400
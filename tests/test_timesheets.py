@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+from construction_erp import models
+from construction_erp.timesheets import import_worklogs
+
+HEADER = "employee_id,log_date,entry_time,exit_time,lunch_duration\n"
+
+
+@pytest.fixture
+def employee(db):
+    employee = models.Employee(name="Ana", hourly_rate=20.0)
+    db.add(employee)
+    db.commit()
+    return employee
+
+
+def test_imports_valid_rows_with_totals(db, employee):
+    csv_text = HEADER + f"{employee.id},2024-03-04,08:00,16:30,45\n"
+
+    result = import_worklogs(db, io.StringIO(csv_text))
+    db.commit()
+
+    assert result["imported"] == 1
+    worklog = db.query(models.WorkLog).one()
+    assert worklog.hours_worked == 8.0
+    assert worklog.gross_pay == 160.0
+
+
+@pytest.mark.parametrize("entry_time, exit_time, column", [
+    ("", "16:00", "entry_time"),
+    ("08:00", "", "exit_time"),
+])
+def test_blank_time_is_reported_for_its_line(db, employee, entry_time, exit_time, column):
+    csv_text = (
+        HEADER
+        + f"{employee.id},2024-03-04,{entry_time},{exit_time},30\n"
+        + f"{employee.id},2024-03-05,08:00,16:00,30\n"
+    )
+
+    result = import_worklogs(db, io.StringIO(csv_text))
+    db.commit()
+
+    assert result["imported"] == 1
+    assert result["errors"] == {2: {column: f"{column.split('_')[0].capitalize()} time is required"}}
+    assert db.query(models.WorkLog).count() == 1
+
+
+def test_missing_time_column_value_is_reported(db, employee):
+    csv_text = HEADER + f"{employee.id},2024-03-04,08:00\n"
+
+    result = import_worklogs(db, io.StringIO(csv_text))
+
+    assert result["imported"] == 0
+    assert "exit_time" in result["errors"][2]
+
+
+def test_upload_with_blank_time_reports_line_instead_of_failing(client, db, employee):
+    csv_text = HEADER + f"{employee.id},2024-03-04,,16:00,30\n"
+
+    response = client.post("/worklogs/import", files={"file": ("week.csv", csv_text, "text/csv")})
+
+    assert response.status_code == 422
+    assert "Line 2: Entry time is required" in response.text
+
+
+def test_upload_that_is_not_utf8_is_rejected(client, db, employee):
+    csv_bytes = (HEADER + f"{employee.id},2024-03-04,08:00,16:00,30\n").encode("utf-8") + "José".encode("cp1252")
+
+    response = client.post("/worklogs/import", files={"file": ("week.csv", csv_bytes, "text/csv")})
+
+    assert response.status_code == 400
+    assert "UTF-8" in response.json()["detail"]
+    assert db.query(models.WorkLog).count() == 0
@@ -0,0 +1,80 @@
+from datetime import date, time
+
+import pytest
+from dateutil import parser
+
+from construction_erp import validation
+from construction_erp.validation import parse_date, parse_time, validate_form_data, validate_many
+
+DATES = [
+    "2024-03-04", " 2024-03-04 ", "2024-3-4", "20240304", "03/04/2024", "2024/03/04", "03-04-2024",
+    "Mar 4, 2024", "March 4, 2024", "4 Mar 2024", "4 March 2024", "12/31/2024", "2024-12-31T00:00:00",
+]
+TIMES = [
+    "08:00", "08:00:30", " 17:45 ", "8:00", "0800", "8:00 AM", "8:00AM", "8:05 pm", "8 PM",
+    "12:00 AM", "12 PM", "23:59:59",
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_parser_caches():
+    validation._parse_date_str.cache_clear()
+    validation._parse_time_str.cache_clear()
+    validation._last_format.update(date=None, time=None)
+
+
+@pytest.mark.parametrize("value", DATES)
+def test_parse_date_matches_dateutil(value):
+    assert parse_date(value) == parser.parse(value).date()
+
+
+@pytest.mark.parametrize("value", TIMES)
+def test_parse_time_matches_dateutil(value):
+    assert parse_time(value) == parser.parse(value).time()
+
+
+def test_last_format_cache_does_not_change_results():
+    # Each value is parsed right after one that matched a different format
+    for value in DATES + list(reversed(DATES)):
+        assert parse_date(value) == parser.parse(value).date(), value
+    for value in TIMES + list(reversed(TIMES)):
+        assert parse_time(value) == parser.parse(value).time(), value
+
+
+@pytest.mark.parametrize("value", ["2024-02-30", "not a date", "13/45/2024", 20240304])
+def test_parse_date_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_date(value)
+
+
+@pytest.mark.parametrize("value", ["25:00", "08:61", "noon-ish", 800])
+def test_parse_time_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_time(value)
+
+
+def test_parsers_pass_through_empty_and_parsed_values():
+    assert parse_date("") is None
+    assert parse_time(None) is None
+    assert parse_date(date(2024, 3, 4)) == date(2024, 3, 4)
+    assert parse_time(time(8, 30)) == time(8, 30)
+
+
+def test_validate_many_reports_invalid_rows_by_position():
+    rows = [
+        {"employee_id": "1", "log_date": "2024-03-04", "entry_time": "08:00", "exit_time": "16:00", "lunch_duration": "30"},
+        {"employee_id": "1", "log_date": "2024-03-04", "entry_time": "16:00", "exit_time": "08:00", "lunch_duration": "30"},
+        {"employee_id": "", "log_date": "03/05/2024", "entry_time": "8:00 AM", "exit_time": "4:00 PM", "lunch_duration": "x"},
+    ]
+
+    errors = validate_many("worklog", rows)
+
+    assert list(errors) == [1, 2]
+    assert errors == {index: validate_form_data("worklog", row) for index, row in enumerate(rows) if index in errors}
+    assert errors[1] == {"exit_time": "Exit time must be after entry time"}
+    assert set(errors[2]) == {"employee_id", "lunch_duration"}
+
+
+def test_validate_many_rejects_unknown_form_type():
+    with pytest.raises(ValueError):
+        validate_many("timesheet", [])
@@ -0,0 +1,127 @@
+"""
+Bulk work log import from timesheet CSV files
+
+Expected columns (same names as the work log form):
+    employee_id, log_date, entry_time, exit_time, lunch_duration
+
+The file is read as a stream, validated batch by batch and valid rows are
+inserted with executemany, all inside the caller's transaction.
+"""
+import csv
+import time
+from typing import Any, Dict, IO, Iterator, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from construction_erp import models, versions
+from construction_erp.validation import validate_many, parse_date, parse_time
+
+# Rows validated and inserted per batch
+IMPORT_BATCH_SIZE = 1000
+
+REQUIRED_COLUMNS = ("employee_id", "log_date", "entry_time", "exit_time", "lunch_duration")
+
+
+def _batches(reader: csv.DictReader, size: int) -> Iterator[List[tuple]]:
+    """Group CSV rows into lists of (line number, row) tuples"""
+    batch = []
+    for row in reader:
+        batch.append((reader.line_num, row))
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_worklogs(db: Session, stream: IO[str], dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Validate and insert work logs from a timesheet CSV
+
+    Args:
+        db: Database session, committed by the caller unless dry_run is set
+        stream: Text stream with CSV content and a header row
+        dry_run: Validate only, do not insert anything
+
+    Returns:
+        Summary with row counts, per-line errors and throughput
+    """
+    started = time.perf_counter()
+    reader = csv.DictReader(stream)
+
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        return {
+            "rows": 0,
+            "valid": 0,
+            "invalid": 0,
+            "imported": 0,
+            "dry_run": dry_run,
+            "errors": {1: {"header": f"Missing columns: {', '.join(missing)}"}},
+            "seconds": 0.0,
+            "rows_per_second": 0.0,
+        }
+
+    # Hourly rates for gross pay, and to reject unknown employees
+    rates = dict(db.query(models.Employee.id, models.Employee.hourly_rate).all())
+
+    worklogs = models.WorkLog.__table__
+    total = 0
+    valid = 0
+    errors = {}
+
+    for batch in _batches(reader, IMPORT_BATCH_SIZE):
+        values = []
+        batch_errors = validate_many("worklog", [row for _, row in batch])
+        for index, (line, row) in enumerate(batch):
+            total += 1
+            row_errors = batch_errors.get(index, {})
+
+            employee_id = None
+            if "employee_id" not in row_errors:
+                try:
+                    employee_id = int(row["employee_id"])
+                    if employee_id not in rates:
+                        row_errors["employee_id"] = "Employee not found"
+                except (ValueError, TypeError):
+                    row_errors["employee_id"] = "Employee must be a valid id"
+
+            if row_errors:
+                errors[line] = row_errors
+                continue
+
+            entry_time = parse_time(row["entry_time"])
+            exit_time = parse_time(row["exit_time"])
+            lunch_duration = int(row["lunch_duration"])
+            hours_worked = models.WorkLog.calculate_hours(entry_time, exit_time, lunch_duration)
+
+            values.append({
+                "employee_id": employee_id,
+                "date": parse_date(row["log_date"]),
+                "entry_time": entry_time,
+                "exit_time": exit_time,
+                "lunch_duration": lunch_duration,
+                "hours_worked": hours_worked,
+                "gross_pay": hours_worked * (rates[employee_id] or 0),
+            })
+
+        if values and not dry_run:
+            db.execute(insert(worklogs), values)
+        valid += len(values)
+
+    imported = 0 if dry_run else valid
+    if imported:
+        versions.bump(db, worklogs.name)
+
+    seconds = time.perf_counter() - started
+    return {
+        "rows": total,
+        "valid": valid,
+        "invalid": len(errors),
+        "imported": imported,
+        "dry_run": dry_run,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(total / seconds, 1) if seconds > 0 else 0.0,
+    }
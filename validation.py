@@ -1,5 +1,6 @@
 from datetime import datetime, date, time
-from typing import Dict, Any, Optional, List, Union
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Optional, List, Union
 from fastapi import HTTPException, status
 from dateutil import parser
 
@@ -51,6 +52,10 @@ def validate_worklog(data: Dict[str, Any]) -> Dict[str, str]:
         entry_time = parse_time(data.get("entry_time"))
         exit_time = parse_time(data.get("exit_time"))
         
+        if entry_time is None:
+            errors["entry_time"] = "Entry time is required"
+        if exit_time is None:
+            errors["exit_time"] = "Exit time is required"
         if entry_time and exit_time and entry_time >= exit_time:
             errors["exit_time"] = "Exit time must be after entry time"
     except (ValueError, TypeError):
@@ -318,6 +323,60 @@ def validate_expense(data: Dict[str, Any]) -> Dict[str, str]:
     return errors
 
 # Helper functions
+
+# Formats tried after the ISO fast path, before falling back to dateutil.
+# None of them can match the same string with a different meaning, so the
+# order only affects speed; ambiguous strings are read month first, as
+# dateutil does.
+DATE_FORMATS = ["%m/%d/%Y", "%Y/%m/%d", "%m-%d-%Y", "%b %d, %Y", "%B %d, %Y", "%d %b %Y", "%d %B %Y"]
+TIME_FORMATS = ["%I:%M %p", "%I:%M%p", "%I %p"]
+
+# Last fallback format that matched, tried first next time: bulk input
+# usually uses one format throughout
+_last_format = {"date": None, "time": None}
+
+def _parse_with_formats(value: str, kind: str, formats: List[str]) -> Optional[datetime]:
+    """Parse with the strptime formats, most recently successful first"""
+    last = _last_format[kind]
+    for fmt in ([last] if last else []) + formats:
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        _last_format[kind] = fmt
+        return parsed
+    return None
+
+@lru_cache(maxsize=4096)
+def _parse_date_str(value: str) -> date:
+    value = value.strip()
+    # Fast path: strict ISO YYYY-MM-DD
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+
+    parsed = _parse_with_formats(value, "date", DATE_FORMATS)
+    if parsed is None:
+        parsed = parser.parse(value)
+    return parsed.date()
+
+@lru_cache(maxsize=4096)
+def _parse_time_str(value: str) -> time:
+    value = value.strip()
+    # Fast path: strict ISO HH:MM or HH:MM:SS
+    if len(value) in (5, 8) and value[2] == ":":
+        try:
+            return time.fromisoformat(value)
+        except ValueError:
+            pass
+
+    parsed = _parse_with_formats(value, "time", TIME_FORMATS)
+    if parsed is None:
+        parsed = parser.parse(value)
+    return parsed.time()
+
 def parse_date(date_str: Optional[str]) -> Optional[date]:
     """Parse date string to date object"""
     if not date_str:
@@ -326,8 +385,8 @@ def parse_date(date_str: Optional[str]) -> Optional[date]:
     try:
         if isinstance(date_str, date):
             return date_str
-        return parser.parse(date_str).date()
-    except (ValueError, TypeError):
+        return _parse_date_str(date_str)
+    except (ValueError, TypeError, AttributeError, OverflowError):
         raise ValueError(f"Invalid date format: {date_str}")
 
 def parse_time(time_str: Optional[str]) -> Optional[time]:
@@ -338,10 +397,22 @@ def parse_time(time_str: Optional[str]) -> Optional[time]:
     try:
         if isinstance(time_str, time):
             return time_str
-        return parser.parse(time_str).time()
-    except (ValueError, TypeError):
+        return _parse_time_str(time_str)
+    except (ValueError, TypeError, AttributeError, OverflowError):
         raise ValueError(f"Invalid time format: {time_str}")
 
+VALIDATION_FUNCTIONS = {
+    "employee": validate_employee,
+    "worklog": validate_worklog,
+    "payment": validate_payment,
+    "project": validate_project,
+    "project_cost": validate_project_cost,
+    "invoice": validate_invoice,
+    "accounts_payable": validate_accounts_payable,
+    "paid_account": validate_paid_account,
+    "expense": validate_expense
+}
+
 def validate_form_data(form_type: str, data: Dict[str, Any]) -> Dict[str, str]:
     """
     Validate form data based on form type
@@ -353,22 +424,37 @@ def validate_form_data(form_type: str, data: Dict[str, Any]) -> Dict[str, str]:
     Returns:
         Dictionary of field errors or empty dict if valid
     """
-    validation_functions = {
-        "employee": validate_employee,
-        "worklog": validate_worklog,
-        "payment": validate_payment,
-        "project": validate_project,
-        "project_cost": validate_project_cost,
-        "invoice": validate_invoice,
-        "accounts_payable": validate_accounts_payable,
-        "paid_account": validate_paid_account,
-        "expense": validate_expense
-    }
-    
-    if form_type not in validation_functions:
+    if form_type not in VALIDATION_FUNCTIONS:
         return {"form": f"Unknown form type: {form_type}"}
     
     try:
-        return validation_functions[form_type](data)
+        return VALIDATION_FUNCTIONS[form_type](data)
     except Exception as e:
         return {"database": f"Validation error: {str(e)}"}
+
+def validate_many(form_type: str, rows: Iterable[Dict[str, Any]]) -> Dict[int, Dict[str, str]]:
+    """
+    Validate many rows of the same form type in one pass
+    
+    Args:
+        form_type: Type of form to validate
+        rows: Form data dictionaries
+    
+    Returns:
+        Field errors of each invalid row, keyed by the row's position in rows
+        (valid rows are left out)
+    """
+    if form_type not in VALIDATION_FUNCTIONS:
+        raise ValueError(f"Unknown form type: {form_type}")
+    
+    validate = VALIDATION_FUNCTIONS[form_type]
+    errors = {}
+    for index, data in enumerate(rows):
+        try:
+            row_errors = validate(data)
+        except Exception as e:
+            row_errors = {"database": f"Validation error: {str(e)}"}
+        if row_errors:
+            errors[index] = row_errors
+    
+    return errors
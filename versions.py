@@ -0,0 +1,70 @@
+"""
+Per-table change counters
+
+Every flush that inserts, updates or deletes rows advances the counter of
+each affected table in the same transaction, so the counters are shared by
+all worker processes and never run ahead of committed data. Code that
+writes through Core statements instead of the ORM calls bump() itself.
+"""
+from datetime import datetime
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, Optional, Tuple
+
+from construction_erp import models
+
+_versions = models.TableVersion.__table__
+
+# Tables whose writes never need to invalidate anything
+UNVERSIONED_TABLES = {_versions.name}
+
+
+def bump(db: Session, *table_names: str) -> None:
+    """Advance the change counter of the given tables"""
+    connection = db.connection()
+    for table_name in sorted(set(table_names) - UNVERSIONED_TABLES):
+        statement = insert(_versions).values(table_name=table_name, version=1, updated_at=func.now())
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=["table_name"],
+            set_={"version": _versions.c.version + 1, "updated_at": func.now()},
+        ))
+
+
+def current(db: Session, table_names: Iterable[str] = None) -> Dict[str, int]:
+    """Get the change counters, optionally limited to some tables"""
+    query = select(_versions.c.table_name, _versions.c.version)
+    if table_names is not None:
+        query = query.where(_versions.c.table_name.in_(list(table_names)))
+
+    versions = dict(db.connection().execute(query).all())
+    if table_names is not None:
+        versions = {name: versions.get(name, 0) for name in table_names}
+    return versions
+
+
+def snapshot(db: Session, table_names: Iterable[str] = None) -> Tuple[Dict[str, int], Optional[datetime]]:
+    """Get the change counters and the time of the latest change, optionally limited to some tables"""
+    query = select(_versions.c.table_name, _versions.c.version, _versions.c.updated_at)
+    if table_names is not None:
+        table_names = list(table_names)
+        query = query.where(_versions.c.table_name.in_(table_names))
+
+    rows = db.connection().execute(query).all()
+    versions = {name: version for name, version, _ in rows}
+    if table_names is not None:
+        versions = {name: versions.get(name, 0) for name in table_names}
+    changed = [updated_at for _, _, updated_at in rows if updated_at is not None]
+    return versions, max(changed) if changed else None
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_flushed_tables(session, flush_context, instances):
+    """Advance the counters of every table touched by this flush"""
+    table_names = {
+        obj.__table__.name
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if hasattr(obj, "__table__")
+    }
+    if table_names:
+        bump(session, *table_names)